@@ -7,10 +7,18 @@ Natural Language Manufacturing Intelligence and Root Cause Analysis
 import asyncio
 import json
 import logging
+import sys
 import time
+from collections import deque
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional
 
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.telemetry import stage
+
 logger = logging.getLogger(__name__)
 
 class ManufacturingReasoner:
@@ -32,6 +40,27 @@ class ManufacturingReasoner:
             }
         }
         self.analysis_history = []
+        self.sensor_findings = deque(maxlen=10000)
+    
+    def ingest_sensor_findings(self, findings: List[Dict]):
+        """Receive anomaly findings from the sensor ingestion pipeline"""
+        self.sensor_findings.extend(findings)
+    
+    def _maintenance_signals(self, limit: int = 3) -> str:
+        """Summarize the sensors with the most recent anomalies"""
+        if not self.sensor_findings:
+            return ""
+        # Imported here: tools.anomaly_detection pulls in pandas (~0.4 s), which
+        # must stay off the query startup path
+        from tools.anomaly_detection import summarize_findings
+        
+        lines = ["", "Predictive Maintenance Signals (sensor anomalies):"]
+        for sensor in summarize_findings(list(self.sensor_findings))[:limit]:
+            lines.append(
+                f"• {sensor['sensor_id']} ({sensor['line']}, {sensor['metric']}): "
+                f"{sensor['anomalies']} anomalies, peak score {sensor['max_abs_score']:.1f} - schedule inspection"
+            )
+        return "\n".join(lines) + "\n"
     
     async def analyze_natural_language_query(self, query: str) -> Dict:
         """Process natural language manufacturing queries"""
@@ -46,23 +75,24 @@ class ManufacturingReasoner:
                 "timestamp": datetime.now().isoformat()
             }
             
-            if "defect" in query_lower or "crack" in query_lower:
-                response.update({
-                    "analysis_type": "defect_analysis",
-                    "main_response": self._analyze_defects(query),
-                    "confidence": 0.9
-                })
-            elif "recommend" in query_lower or "optimize" in query_lower:
-                response.update({
-                    "analysis_type": "recommendation", 
-                    "main_response": self._generate_recommendations(query),
-                    "confidence": 0.85
-                })
-            else:
-                response.update({
-                    "main_response": self._generate_general_response(query),
-                    "confidence": 0.7
-                })
+            with stage("synthesis"):
+                if "defect" in query_lower or "crack" in query_lower:
+                    response.update({
+                        "analysis_type": "defect_analysis",
+                        "main_response": self._analyze_defects(query),
+                        "confidence": 0.9
+                    })
+                elif "recommend" in query_lower or "optimize" in query_lower:
+                    response.update({
+                        "analysis_type": "recommendation", 
+                        "main_response": self._generate_recommendations(query),
+                        "confidence": 0.85
+                    })
+                else:
+                    response.update({
+                        "main_response": self._generate_general_response(query),
+                        "confidence": 0.7
+                    })
             
             response["processing_time"] = time.time() - start_time
             return response
@@ -110,7 +140,7 @@ Expected Benefits:
 
 Implementation Priority: HIGH
 Timeline: 3-6 months for full deployment
-"""
+{self._maintenance_signals()}"""
     
     def _generate_general_response(self, query: str) -> str:
         return f"""
@@ -0,0 +1 @@
+"""Tire Manufacturing RAG System Package"""
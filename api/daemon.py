@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+🔌 Persistent Query Daemon for the Tire Manufacturing RAG System
+Keeps the orchestrator warm behind a local Unix socket (JSON lines)
+"""
+
+import json
+import logging
+import os
+import socket
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = Path("data/run/orchestrator.sock")
+CLIENT_TIMEOUT_SECONDS = 300.0
+PING_TIMEOUT_SECONDS = 2.0
+
+class OrchestratorDaemon:
+    """Serves queries from one initialized orchestrator over a Unix socket
+
+    Each request is one JSON line: ``{"op": "query", "query": ..., "query_type": ...}``,
+    ``{"op": "ping"}`` or ``{"op": "shutdown"}``; each response is one JSON
+    line. Connections are handled concurrently on the daemon's event loop.
+    """
+
+    def __init__(self, orchestrator, socket_path: Path = DEFAULT_SOCKET_PATH):
+        self.orchestrator = orchestrator
+        self.socket_path = Path(socket_path)
+        self.queries_served = 0
+        self._server = None
+        self._stopping = False
+
+    async def serve(self):
+        """Initialize the orchestrator once, then serve until shut down"""
+        import asyncio
+
+        if self.orchestrator.system_status != "ready":
+            await self.orchestrator.initialize_system(show_progress=False)
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        # Connecting (not pinging) also catches a live daemon too busy to answer
+        if socket_accepting(self.socket_path):
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        self.socket_path.unlink(missing_ok=True)  # Stale socket from a crashed daemon
+
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"Daemon listening on {self.socket_path}")
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.socket_path.unlink(missing_ok=True)
+            self.orchestrator.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self._dispatch(line)
+                writer.write(json.dumps(response, default=str).encode() + b"\n")
+                await writer.drain()
+                if self._stopping:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            if self._stopping:
+                self._server.close()
+
+    async def _dispatch(self, line: bytes) -> Dict:
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {"status": "error", "error": f"Invalid request: {e}"}
+        if not isinstance(request, dict):
+            return {"status": "error", "error": "Invalid request: expected a JSON object"}
+
+        op = request.get("op", "query")
+        if op == "ping":
+            pool = getattr(self.orchestrator, "pool", None)
+            return {"status": "ok", "system_status": self.orchestrator.system_status,
+                    "queries_served": self.queries_served, "pid": os.getpid(),
+                    "components": getattr(self.orchestrator, "component_status", {}),
+                    "worker_pool": pool.stats() if pool is not None else None}
+        if op == "metrics":
+            from tools.telemetry import metrics_payload
+
+            return {"status": "ok", "metrics": metrics_payload()[0].decode()}
+        if op in ("profile_start", "profile_stop", "profile_status"):
+            return self._profile(op, request)
+        if op == "shutdown":
+            self._stopping = True  # The server closes once this reply is sent
+            return {"status": "ok"}
+        if op == "query":
+            query = request.get("query")
+            if not isinstance(query, str) or not query.strip():
+                return {"status": "error", "error": "A query request needs a non-empty 'query' string"}
+            self.queries_served += 1
+            return await self.orchestrator.process_query(query, request.get("query_type", "auto"))
+        return {"status": "error", "error": f"Unknown op: {op}"}
+
+    def _profile(self, op: str, request: Dict) -> Dict:
+        """Toggle the sampling profiler (the daemon's loop runs on the main thread)"""
+        from tools import profiler
+
+        try:
+            if op == "profile_start":
+                options = {key: request[key] for key in ("rate_hz", "mode", "duration") if request.get(key)}
+                return {"status": "ok", **profiler.start_profiling(**options)}
+            if op == "profile_stop":
+                return {"status": "ok", **profiler.stop_profiling()}
+            return {"status": "ok", **profiler.profiling_status()}
+        except (RuntimeError, ValueError) as e:
+            return {"status": "error", "error": str(e)}
+
+def send_request(request: Dict, socket_path: Path = DEFAULT_SOCKET_PATH,
+                 timeout: float = CLIENT_TIMEOUT_SECONDS) -> Optional[Dict]:
+    """Send one request to the daemon; None when no daemon answers in time
+
+    Any socket error (refused, stale path, permissions, timeout against a
+    busy or hung daemon) means "no daemon", so callers fall back to running
+    in-process. Uses a plain blocking socket so the client imports nothing heavy.
+    """
+    if not hasattr(socket, "AF_UNIX") or not Path(socket_path).exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+            client.sendall(json.dumps(request).encode() + b"\n")
+            with client.makefile("rb") as stream:
+                line = stream.readline()
+    except OSError as e:
+        logger.debug(f"Daemon at {socket_path} unavailable: {e}")
+        return None
+    try:
+        return json.loads(line) if line else None
+    except ValueError:
+        return None
+
+def query_daemon(query: str, query_type: str = "auto", socket_path: Path = DEFAULT_SOCKET_PATH,
+                 timeout: float = CLIENT_TIMEOUT_SECONDS) -> Optional[Dict]:
+    """Run a query on the warm daemon; None means the caller should run it in-process
+
+    A quick ping first, so a hung daemon costs ``PING_TIMEOUT_SECONDS`` rather
+    than the full query timeout (a busy one still answers pings from its loop).
+    """
+    if not daemon_running(socket_path):
+        return None
+    return send_request({"op": "query", "query": query, "query_type": query_type}, socket_path, timeout)
+
+def daemon_running(socket_path: Path = DEFAULT_SOCKET_PATH) -> bool:
+    return send_request({"op": "ping"}, socket_path, timeout=PING_TIMEOUT_SECONDS) is not None
+
+def socket_accepting(socket_path: Path = DEFAULT_SOCKET_PATH) -> bool:
+    """Whether some process accepts connections on ``socket_path`` (responsive or not)"""
+    if not hasattr(socket, "AF_UNIX") or not Path(socket_path).exists():
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(1.0)
+            client.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+🌐 HTTP Serving Layer for the Tire Manufacturing RAG System
+KPI snapshots, inspection ingestion and live KPI push (SSE and WebSocket)
+"""
+
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dashboards.business_intelligence import TireManufacturingBI
+from dashboards.kpi_channel import INSPECTIONS_TOPIC, KPI_TOPIC, KPIBroker
+from tools import profiler
+from tools.telemetry import metrics_payload
+
+SSE_KEEPALIVE_SECONDS = 15.0
+
+class QueryRequest(BaseModel):
+    query: str = Field(min_length=1)
+    query_type: str = "auto"
+
+def _publish_all(broker: KPIBroker, results: List[Dict]):
+    for result in results:
+        broker.publish(INSPECTIONS_TOPIC, result)
+
+def create_app(bi: Optional[TireManufacturingBI] = None, broker: Optional[KPIBroker] = None,
+               orchestrator=None) -> FastAPI:
+    """Build the FastAPI application around a BI instance and KPI broker
+
+    With an orchestrator, ``POST /query`` answers natural-language queries;
+    without one the server never loads the query engines.
+    """
+    bi = bi or TireManufacturingBI()
+    broker = broker or KPIBroker()
+    if bi.broker is None:
+        bi.attach_broker(broker)
+    # Publishing runs the BI listeners inline (KPIs, SPC and the Parquet store,
+    # which may write 100k rows), so it happens on one ordered thread off the loop
+    ingest_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inspection-ingest")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        broker.bind(asyncio.get_running_loop())
+        bi.start_report_job()
+        if orchestrator is not None and orchestrator.system_status != "ready":
+            await orchestrator.initialize_system(show_progress=False)
+        yield
+        ingest_executor.shutdown(wait=True)
+        bi.close()  # Stops the report job and flushes buffered inspections
+        if orchestrator is not None:
+            orchestrator.close()
+
+    app = FastAPI(title="Tire Manufacturing RAG System", lifespan=lifespan)
+    app.state.bi = bi
+    app.state.broker = broker
+
+    @app.get("/health")
+    async def health() -> Dict:
+        return {"status": "ok", "kpi_subscribers": broker.subscriber_count(KPI_TOPIC)}
+
+    @app.get("/metrics")
+    async def metrics() -> Response:
+        """Per-stage latency histograms in the Prometheus text format"""
+        payload, content_type = metrics_payload()
+        return Response(payload, media_type=content_type)
+
+    @app.get("/profiler")
+    async def profiler_status() -> Dict:
+        return profiler.profiling_status()
+
+    @app.post("/profiler/start")
+    async def profiler_start(rate_hz: float = profiler.DEFAULT_RATE_HZ, mode: str = "cpu",
+                             duration: Optional[float] = None) -> Dict:
+        """Start sampling this server; stacks go to data/reports/*.collapsed on stop"""
+        try:
+            return profiler.start_profiling(rate_hz=rate_hz, mode=mode, duration=duration)
+        except (RuntimeError, ValueError) as e:
+            return {"error": str(e)}
+
+    @app.post("/profiler/stop")
+    async def profiler_stop() -> Dict:
+        return profiler.stop_profiling()
+
+    @app.post("/query")
+    async def query(request: QueryRequest) -> Dict:
+        """Answer one query: {"query": "...", "query_type": "auto"}"""
+        if orchestrator is None:
+            return {"status": "error", "error": "Query answering is not enabled (start the server with --with-query)"}
+        return await orchestrator.process_query(request.query, request.query_type)
+
+    @app.get("/kpi")
+    async def kpi_snapshot() -> Dict:
+        return bi.generate_kpi_dashboard()
+
+    @app.get("/reports/daily")
+    async def daily_report() -> Dict:
+        """Latest precomputed daily report (built in the background)"""
+        report = bi.latest_daily_report()
+        return report if report is not None else {"error": "No daily report generated yet"}
+
+    @app.post("/inspections")
+    async def ingest_inspections(results: Union[Dict, List[Dict]]) -> Dict:
+        """Entry point for inspection stations that run out of process"""
+        results = results if isinstance(results, list) else [results]
+        await asyncio.get_running_loop().run_in_executor(ingest_executor, _publish_all, broker, results)
+        return {"accepted": len(results)}
+
+    @app.get("/kpi/stream")
+    async def kpi_stream(max_rate: Optional[float] = None) -> StreamingResponse:
+        """Server-sent events carrying coalesced KPI deltas"""
+        subscription = broker.subscribe(KPI_TOPIC, max_rate)
+
+        async def events():
+            try:
+                while True:
+                    try:
+                        delta = await asyncio.wait_for(subscription.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+                        continue
+                    yield f"event: kpi\ndata: {json.dumps(delta, default=str)}\n\n"
+            finally:
+                subscription.close()
+
+        return StreamingResponse(events(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache"})
+
+    @app.websocket("/kpi/ws")
+    async def kpi_websocket(websocket: WebSocket):
+        """WebSocket carrying coalesced KPI deltas"""
+        await websocket.accept()
+        subscription = broker.subscribe(KPI_TOPIC)
+        try:
+            async for delta in subscription:
+                await websocket.send_text(json.dumps(delta, default=str))
+        except WebSocketDisconnect:
+            pass
+        finally:
+            subscription.close()
+
+    return app
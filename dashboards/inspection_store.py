@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+🗄️ Columnar Inspection Result Store for Tire Manufacturing BI
+Per-tire inspection results in date-partitioned Parquet, aggregated with DuckDB
+"""
+
+import atexit
+import logging
+import threading
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import duckdb
+import polars as pl
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = Path("data/inspections")
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+INSPECTION_SCHEMA = {
+    "timestamp": pl.Datetime("us"),
+    "line": pl.Utf8,
+    "shift": pl.Utf8,
+    "defect_class": pl.Utf8,
+    "confidence": pl.Float64,
+    "latency": pl.Float64,
+    "actual_defective": pl.Boolean,
+}
+
+GRANULARITIES = ("minute", "hour", "day", "week", "month")
+
+class InspectionStore:
+    """Append-only Parquet store partitioned by inspection date (``date=YYYY-MM-DD``)
+
+    Results are buffered and written once ``flush_rows`` accumulate, or by a
+    background thread once the oldest has waited ``flush_interval`` seconds,
+    so low-volume lines still persist promptly. ``close()`` (also run at
+    exit) writes whatever is left.
+    """
+
+    def __init__(self, root: Path = DEFAULT_STORE_PATH, flush_rows: int = 100_000,
+                 flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+        self._connection = duckdb.connect()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+
+    def append(self, result: Dict):
+        """Buffer one inspection result, flushing to Parquet when the buffer is full"""
+        self.append_many([result])
+
+    def append_many(self, results: List[Dict]):
+        """Buffer a batch of inspection results"""
+        if self._closed:
+            raise RuntimeError("Inspection store is closed")
+        self._ensure_flusher()
+        with self._lock:
+            self._buffer.extend(_normalize(result) for result in results)
+            if len(self._buffer) >= self.flush_rows:
+                self._flush_locked()
+
+    def flush(self):
+        """Write buffered results to their date partitions"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Write buffered results and stop the flusher (idempotent)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            self._flush_locked()
+            self._connection.close()
+
+    def _ensure_flusher(self):
+        if self._flusher is not None or not self.flush_interval:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run_flusher, name="inspection-store-flusher",
+                                                 daemon=True)
+                self._flusher.start()
+                atexit.register(self.close)
+
+    def _run_flusher(self):
+        # Anything buffered when the timer fires has waited at most flush_interval
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Inspection store flush failed: {e}")
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+
+        frame = pl.DataFrame(self._buffer, schema=INSPECTION_SCHEMA, orient="row")
+        self._buffer = []
+
+        frame = frame.with_columns(pl.col("timestamp").dt.date().alias("_date"))
+        for (partition_date,), part in frame.partition_by("_date", as_dict=True).items():
+            partition = self.root / f"date={partition_date.isoformat()}"
+            partition.mkdir(parents=True, exist_ok=True)
+            part.drop("_date").sort("timestamp").write_parquet(
+                partition / f"part-{uuid.uuid4().hex}.parquet", compression="zstd", statistics=True
+            )
+
+    def partitions(self) -> List[date]:
+        """Dates that have at least one Parquet file"""
+        return sorted(
+            date.fromisoformat(p.name.split("=", 1)[1])
+            for p in self.root.glob("date=*")
+            if any(p.glob("*.parquet"))
+        )
+
+    def compact_partition(self, partition_date: date):
+        """Merge a day's part files into a single sorted file to keep scans fast"""
+        partition = self.root / f"date={partition_date.isoformat()}"
+        parts = sorted(partition.glob("*.parquet"))
+        if len(parts) < 2:
+            return
+
+        merged = partition / f"part-{uuid.uuid4().hex}.parquet"
+        file_list = ", ".join(f"'{p.as_posix()}'" for p in parts)
+        with self._lock:
+            self._connection.cursor().execute(
+                f"COPY (SELECT * FROM read_parquet([{file_list}]) ORDER BY timestamp) "
+                f"TO '{merged.as_posix()}' (FORMAT PARQUET, COMPRESSION ZSTD)"
+            )
+        for p in parts:
+            p.unlink()
+
+    def iter_batches(self, day: date, columns: Sequence[str] = tuple(INSPECTION_SCHEMA),
+                     chunk_rows: int = 65_536) -> Iterator[pa.RecordBatch]:
+        """Stream one day's inspections as Arrow record batches of at most ``chunk_rows`` rows
+
+        DuckDB reads the partition lazily, so memory stays bounded by the
+        chunk size however many inspections the day holds.
+        """
+        self.flush()
+        partition = self.root / f"date={day.isoformat()}"
+        if not any(partition.glob("*.parquet")):
+            return
+
+        column_list = ", ".join(columns)
+        cursor = self._connection.cursor()
+        cursor.execute(f"SELECT {column_list} FROM read_parquet('{(partition / '*.parquet').as_posix()}')")
+        yield from cursor.fetch_record_batch(chunk_rows)
+
+    def query_kpis(self, start: date, end: date, granularity: Optional[str] = "day",
+                   group_by_line: bool = False) -> List[Dict]:
+        """Aggregate KPIs for inspections dated start..end (inclusive)
+
+        Only the partitions inside the date range are scanned, and only the
+        columns the aggregates need are read from each file.
+        """
+        if granularity is not None and granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity} (expected one of {GRANULARITIES})")
+
+        self.flush()
+        if not any(self.root.glob("date=*/*.parquet")):
+            return []
+
+        group_columns = []
+        if granularity is not None:
+            group_columns.append(f"date_trunc('{granularity}', timestamp) AS period")
+        if group_by_line:
+            group_columns.append("line")
+        select_groups = "".join(f"{column}, " for column in group_columns)
+        group_clause = "GROUP BY ALL ORDER BY ALL" if group_columns else ""
+
+        sql = f"""
+            SELECT {select_groups}
+                count(*) AS inspections,
+                count(*) FILTER (WHERE defect_class <> 'none') AS defects,
+                avg(latency) AS avg_latency,
+                count(latency) AS latency_samples,
+                approx_quantile(latency, 0.95) AS p95_latency,
+                avg(confidence) AS avg_confidence,
+                count(*) FILTER (WHERE actual_defective AND defect_class <> 'none') AS tp,
+                count(*) FILTER (WHERE actual_defective AND defect_class = 'none') AS fn,
+                count(*) FILTER (WHERE NOT actual_defective AND defect_class = 'none') AS tn,
+                count(*) FILTER (WHERE NOT actual_defective AND defect_class <> 'none') AS fp
+            FROM read_parquet('{(self.root / "date=*" / "*.parquet").as_posix()}',
+                              hive_partitioning = true, hive_types = {{'date': DATE}})
+            WHERE date BETWEEN ? AND ?
+            {group_clause}
+        """
+        cursor = self._connection.cursor()
+        cursor.execute(sql, [start, end])
+        columns = [column[0] for column in cursor.description]
+        return [_derive_kpis(dict(zip(columns, row))) for row in cursor.fetchall()]
+
+def parse_timestamp(value: Union[datetime, str, int, float, None]) -> datetime:
+    """Coerce an ISO string or epoch seconds into a datetime (now if missing)"""
+    if value is None:
+        return datetime.now()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    return value
+
+def _normalize(result: Dict) -> Dict:
+    """Coerce an inspection result into the store schema"""
+    return {
+        "timestamp": parse_timestamp(result.get("timestamp")),
+        "line": result.get("line"),
+        "shift": result.get("shift"),
+        "defect_class": result.get("defect_class", "none"),
+        "confidence": result.get("confidence"),
+        "latency": result.get("latency"),
+        "actual_defective": result.get("actual_defective"),
+    }
+
+def _derive_kpis(row: Dict) -> Dict:
+    """Add rates derived from the aggregate counts"""
+    inspections = row["inspections"]
+    positives, negatives = row["tp"] + row["fn"], row["tn"] + row["fp"]
+    avg_latency = row["avg_latency"]
+
+    row.update({
+        "defect_rate": row["defects"] / inspections if inspections else 0.0,
+        "fps": 1.0 / avg_latency if avg_latency else 0.0,
+        "sensitivity": row["tp"] / positives if positives else None,
+        "specificity": row["tn"] / negatives if negatives else None,
+    })
+    return row
+
+def week_bounds(day: Union[date, datetime]) -> tuple:
+    """Monday..Sunday range containing the given day"""
+    day = day.date() if isinstance(day, datetime) else day
+    start = day - timedelta(days=day.weekday())
+    return start, start + timedelta(days=6)
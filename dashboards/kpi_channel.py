@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+📡 KPI Publish/Subscribe Channel
+In-process broker carrying inspection results to BI and KPI deltas to dashboards
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INSPECTIONS_TOPIC = "inspections"
+KPI_TOPIC = "kpi"
+DEFAULT_MAX_UPDATES_PER_SECOND = 4.0
+
+def merge_deltas(current: Optional[Dict], delta: Dict) -> Dict:
+    """Coalesce two KPI deltas: counts add up, gauges keep the latest value"""
+    if current is None:
+        return {
+            "counts": dict(delta.get("counts", {})),
+            "gauges": dict(delta.get("gauges", {})),
+            "events": delta.get("events", 1)
+        }
+
+    counts = current["counts"]
+    for key, value in delta.get("counts", {}).items():
+        counts[key] = counts.get(key, 0) + value
+    current["gauges"].update(delta.get("gauges", {}))
+    current["events"] += delta.get("events", 1)
+    return current
+
+class Subscription:
+    """Rate-limited async stream of coalesced deltas for one client
+
+    Deltas published between two deliveries are merged, so a client sees at
+    most ``max_updates_per_second`` messages no matter how fast the producer is.
+    """
+
+    def __init__(self, broker: "KPIBroker", topic: str, max_updates_per_second: float):
+        self.broker = broker
+        self.topic = topic
+        self.min_interval = 1.0 / max_updates_per_second if max_updates_per_second > 0 else 0.0
+        self._pending: Optional[Dict] = None
+        self._ready = asyncio.Event()
+        self._last_delivery = 0.0
+        self.closed = False
+
+    def _offer(self, delta: Dict):
+        """Called on the broker's event loop"""
+        self._pending = merge_deltas(self._pending, delta)
+        self._ready.set()
+
+    async def get(self) -> Dict:
+        """Wait for the next coalesced delta"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._ready.wait()
+            wait = self._last_delivery + self.min_interval - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)  # Keep merging while we hold back
+            self._ready.clear()
+            delta, self._pending = self._pending, None
+            if delta is not None:
+                self._last_delivery = loop.time()
+                return delta
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.broker._unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict:
+        if self.closed:
+            raise StopAsyncIteration
+        return await self.get()
+
+class KPIBroker:
+    """Local in-process broker
+
+    ``publish`` may be called from any thread (the inspection pipeline and
+    worker threads); async subscriptions are served on the loop the broker
+    is bound to. Synchronous listeners run inline in the publishing thread.
+    """
+
+    def __init__(self, max_updates_per_second: float = DEFAULT_MAX_UPDATES_PER_SECOND):
+        self.max_updates_per_second = max_updates_per_second
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+        self._listeners: Dict[str, List[Callable[[Dict], None]]] = {}
+        self._lock = threading.Lock()
+
+    def bind(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Attach the broker to the event loop that serves subscriptions"""
+        self._loop = loop or asyncio.get_running_loop()
+
+    def add_listener(self, topic: str, callback: Callable[[Dict], None]):
+        """Call ``callback`` synchronously for every message on a topic"""
+        with self._lock:
+            self._listeners.setdefault(topic, []).append(callback)
+
+    def subscribe(self, topic: str = KPI_TOPIC, max_updates_per_second: Optional[float] = None) -> Subscription:
+        """Open a coalescing subscription (must be called on the bound loop)"""
+        if self._loop is None:
+            self.bind()
+        subscription = Subscription(self, topic, max_updates_per_second or self.max_updates_per_second)
+        with self._lock:
+            self._subscriptions.setdefault(topic, []).append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.topic, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+
+    def subscriber_count(self, topic: str = KPI_TOPIC) -> int:
+        return len(self._subscriptions.get(topic, []))
+
+    def publish(self, topic: str, message: Dict):
+        """Deliver a message to listeners and subscriptions on a topic"""
+        with self._lock:
+            listeners = list(self._listeners.get(topic, ()))
+            subscribers = list(self._subscriptions.get(topic, ()))
+
+        for callback in listeners:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f"KPI listener failed on {topic}: {e}")
+
+        if not subscribers or self._loop is None or self._loop.is_closed():
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self._loop:
+            self._fan_out(subscribers, message)
+        else:
+            self._loop.call_soon_threadsafe(self._fan_out, subscribers, message)
+
+    @staticmethod
+    def _fan_out(subscribers: List[Subscription], message: Dict):
+        for subscription in subscribers:
+            if not subscription.closed:
+                subscription._offer(message)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+📈 Incremental KPI Engine for Tire Manufacturing BI
+Maintains running aggregates over a stream of inspection results
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DEFECT_FREE_CLASS = "none"
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+
+class RunningStats:
+    """Welford running mean/variance with min and max"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+class P2Quantile:
+    """Streaming quantile estimate in O(1) memory (Jain & Chlamtac P² algorithm)"""
+
+    def __init__(self, quantile: float):
+        self.quantile = quantile
+        self._initial: List[float] = []
+        self._heights: Optional[List[float]] = None
+        self._positions: List[float] = []
+        self._desired: List[float] = []
+        self._increments: List[float] = []
+
+    def add(self, value: float):
+        if self._heights is None:
+            self._initial.append(value)
+            if len(self._initial) == 5:
+                p = self.quantile
+                self._heights = sorted(self._initial)
+                self._positions = [0, 1, 2, 3, 4]
+                self._desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+                self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+            return
+
+        q, n = self._heights, self._positions
+        if value < q[0]:
+            q[0] = value
+            cell = 0
+        elif value >= q[4]:
+            q[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if q[i] <= value < q[i + 1])
+
+        for i in range(cell + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Adjust the three middle markers towards their desired positions
+        for i in range(1, 4):
+            offset = self._desired[i] - n[i]
+            if (offset >= 1 and n[i + 1] - n[i] > 1) or (offset <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = height
+                n[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if self._heights is not None:
+            return self._heights[2]
+        if not self._initial:
+            return None
+        ordered = sorted(self._initial)
+        return ordered[int(round(self.quantile * (len(ordered) - 1)))]
+
+class KPIEngine:
+    """Running KPI aggregates fed by inspection events
+
+    Each event is a per-tire inspection result with ``timestamp``, ``line``,
+    ``shift``, ``defect_class`` (``"none"`` for a good tire), ``confidence``,
+    ``latency`` in seconds and, when the tire was audited, ``actual_defective``.
+    Legacy CV test reports are ingested as a summary baseline that live events
+    override once they arrive. Every dashboard view reads the same snapshot,
+    which is rebuilt only after new data has been ingested.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot: Optional[Dict] = None
+        self._snapshot_version = -1
+        self._report: Optional[Dict] = None
+
+        self.total_inspections = 0
+        self.defects_detected = 0
+        self.defect_counts: Dict[str, int] = {}
+        self.line_counts: Dict[str, int] = {}
+        self.confusion = {"tp": 0, "fp": 0, "tn": 0, "fn": 0}
+        self.latency = RunningStats()
+        self.latency_quantiles = {q: P2Quantile(q) for q in LATENCY_QUANTILES}
+        self.confidence = RunningStats()
+        self.last_event_time: Optional[str] = None
+
+    @property
+    def has_data(self) -> bool:
+        return self._report is not None or self.total_inspections > 0
+
+    def ingest_report(self, cv_report: Dict):
+        """Use a CV test report summary as the baseline"""
+        with self._lock:
+            self._report = cv_report
+            self._version += 1
+
+    def ingest(self, event: Dict) -> Dict:
+        """Update running aggregates with one inspection result and return the KPI delta"""
+        return self.ingest_many([event])
+
+    def ingest_many(self, events: List[Dict]) -> Dict:
+        """Update running aggregates with a batch of inspection results and return the KPI delta
+
+        The delta holds additive ``counts`` for the batch and the resulting
+        headline ``gauges``, so consumers can merge deltas without a snapshot.
+        """
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for event in events:
+                self._ingest_locked(event, counts)
+            self._version += 1
+            return {"counts": counts, "gauges": self._gauges_locked(), "events": len(events)}
+
+    def _ingest_locked(self, event: Dict, counts: Dict[str, int]):
+        self.total_inspections += 1
+        counts["inspections"] = counts.get("inspections", 0) + 1
+
+        defect_class = event.get("defect_class", DEFECT_FREE_CLASS)
+        predicted_defective = defect_class != DEFECT_FREE_CLASS
+        if predicted_defective:
+            self.defects_detected += 1
+            counts["defects"] = counts.get("defects", 0) + 1
+        self.defect_counts[defect_class] = self.defect_counts.get(defect_class, 0) + 1
+
+        line = event.get("line")
+        if line is not None:
+            self.line_counts[line] = self.line_counts.get(line, 0) + 1
+
+        actual_defective = event.get("actual_defective")
+        if actual_defective is not None:
+            key = ("t" if predicted_defective == bool(actual_defective) else "f") + ("p" if predicted_defective else "n")
+            self.confusion[key] += 1
+            counts[key] = counts.get(key, 0) + 1
+
+        latency = event.get("latency")
+        if latency is not None:
+            self.latency.add(latency)
+            for estimator in self.latency_quantiles.values():
+                estimator.add(latency)
+
+        confidence = event.get("confidence")
+        if confidence is not None:
+            self.confidence.add(confidence)
+
+        timestamp = event.get("timestamp")
+        if timestamp is not None:
+            self.last_event_time = timestamp.isoformat() if isinstance(timestamp, datetime) else str(timestamp)
+
+    def _gauges_locked(self) -> Dict:
+        """Headline KPIs computable in O(1) from the running counters"""
+        c = self.confusion
+        positives, negatives = c["tp"] + c["fn"], c["tn"] + c["fp"]
+        avg_time = self.latency.mean
+        return {
+            "total_inspections": self.total_inspections,
+            "defect_rate": self.defects_detected / self.total_inspections if self.total_inspections else 0.0,
+            "inference_speed_ms": avg_time * 1000,
+            "fps": 1.0 / avg_time if avg_time > 0 else 0.0,
+            "sensitivity": c["tp"] / positives if positives else None,
+            "specificity": c["tn"] / negatives if negatives else None,
+            "last_updated": self.last_event_time
+        }
+
+    def snapshot(self) -> Dict:
+        """Current KPIs; the same object is returned until new data arrives (treat as read-only)"""
+        with self._lock:
+            if self._snapshot_version != self._version:
+                self._snapshot = self._build_snapshot()
+                self._snapshot_version = self._version
+            return self._snapshot
+
+    def _build_snapshot(self) -> Dict:
+        report = self._report or {}
+        report_perf = report.get("performance_metrics", {})
+        report_acc = report.get("accuracy_results", {})
+
+        if self.latency.count:
+            avg_time = self.latency.mean
+            performance = {
+                "inference_speed_ms": avg_time * 1000,
+                "fps": 1.0 / avg_time if avg_time > 0 else 0,
+                "meets_requirements": avg_time < 0.1
+            }
+        else:
+            performance = {
+                "inference_speed_ms": report_perf.get("average_inference_time", 0) * 1000,
+                "fps": report_perf.get("fps", 0),
+                "meets_requirements": report_perf.get("meets_100ms_requirement", False)
+            }
+
+        c = self.confusion
+        labelled = sum(c.values())
+        if labelled:
+            positives, negatives = c["tp"] + c["fn"], c["tn"] + c["fp"]
+            quality = {
+                "sensitivity": c["tp"] / positives if positives else 0,
+                "specificity": c["tn"] / negatives if negatives else 0,
+                "total_tests": labelled
+            }
+        else:
+            quality = {
+                "sensitivity": report_acc.get("sensitivity", 0),
+                "specificity": report_acc.get("specificity", 0),
+                "total_tests": report_acc.get("total_tests", 0)
+            }
+
+        kpis = {
+            "performance_metrics": performance,
+            "quality_metrics": quality,
+            "system_health": {
+                "last_updated": self.last_event_time or report.get("timestamp", "Unknown"),
+                "test_status": "streaming" if self.total_inspections else report.get("test_status", "unknown")
+            }
+        }
+
+        if self.total_inspections:
+            kpis["production_metrics"] = {
+                "total_inspections": self.total_inspections,
+                "defects_detected": self.defects_detected,
+                "defect_rate": self.defects_detected / self.total_inspections,
+                "defect_counts": dict(self.defect_counts),
+                "line_counts": dict(self.line_counts),
+                "latency_ms_quantiles": {
+                    f"p{int(q * 100)}": (estimator.value() or 0) * 1000
+                    for q, estimator in self.latency_quantiles.items()
+                },
+                "mean_confidence": self.confidence.mean
+            }
+
+        return kpis
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+🗓️ Background Daily Report Generation for Tire Manufacturing BI
+Builds daily reports from the columnar store in bounded-memory chunks
+"""
+
+import json
+import logging
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from tools.async_storage import write_json_atomic
+from tools.telemetry import stage
+
+logger = logging.getLogger(__name__)
+
+REPORT_COLUMNS = ("timestamp", "line", "defect_class", "confidence", "latency", "actual_defective")
+DEFAULT_CHUNK_ROWS = 65_536
+DEFAULT_INTERVAL_SECONDS = 300.0
+
+# Log-spaced latency histogram (0.1 ms .. 10 s) for fixed-memory quantiles
+LATENCY_BIN_EDGES = np.logspace(-4, 1, 401)
+REPORT_QUANTILES = (0.5, 0.95, 0.99)
+
+def report_path(data_path: Path, day: date) -> Path:
+    return Path(data_path) / f"daily_report_{day.strftime('%Y%m%d')}.json"
+
+def latest_report_path(data_path: Path) -> Optional[Path]:
+    """Most recent daily report on disk, or None"""
+    reports = sorted(Path(data_path).glob("daily_report_*.json"))
+    return reports[-1] if reports else None
+
+class DailyAggregate:
+    """Additive KPI accumulators for one day, fed one Arrow batch at a time
+
+    Memory is fixed: counters, a latency histogram and 24 hourly buckets,
+    independent of how many inspections are scanned.
+    """
+
+    def __init__(self):
+        self.inspections = 0
+        self.defects = 0
+        self.defect_counts: Dict[str, int] = {}
+        self.line_counts: Dict[str, int] = {}
+        self.confusion = {"tp": 0, "fp": 0, "tn": 0, "fn": 0}
+        self.latency_sum = 0.0
+        self.latency_samples = 0
+        self.latency_histogram = np.zeros(len(LATENCY_BIN_EDGES) + 1, dtype=np.int64)
+        self.confidence_sum = 0.0
+        self.confidence_samples = 0
+        self.hourly_inspections = np.zeros(24, dtype=np.int64)
+        self.hourly_defects = np.zeros(24, dtype=np.int64)
+        self.last_timestamp: Optional[datetime] = None
+        self.batches = 0
+
+    def add_batch(self, batch: pa.RecordBatch):
+        rows = batch.num_rows
+        if not rows:
+            return
+        self.batches += 1
+        self.inspections += rows
+
+        defect_class = pc.fill_null(batch.column("defect_class"), "none")
+        predicted = pc.not_equal(defect_class, "none").to_numpy(zero_copy_only=False)
+        self.defects += int(predicted.sum())
+        _add_value_counts(self.defect_counts, defect_class)
+        _add_value_counts(self.line_counts, batch.column("line"))
+
+        actual = batch.column("actual_defective")
+        labelled = pc.is_valid(actual).to_numpy(zero_copy_only=False)
+        actual = pc.fill_null(actual, False).to_numpy(zero_copy_only=False)
+        self.confusion["tp"] += int((labelled & actual & predicted).sum())
+        self.confusion["fn"] += int((labelled & actual & ~predicted).sum())
+        self.confusion["tn"] += int((labelled & ~actual & ~predicted).sum())
+        self.confusion["fp"] += int((labelled & ~actual & predicted).sum())
+
+        latency = _valid_values(batch.column("latency"))
+        self.latency_sum += float(latency.sum())
+        self.latency_samples += len(latency)
+        self.latency_histogram += np.bincount(np.searchsorted(LATENCY_BIN_EDGES, latency),
+                                              minlength=len(self.latency_histogram))
+
+        confidence = _valid_values(batch.column("confidence"))
+        self.confidence_sum += float(confidence.sum())
+        self.confidence_samples += len(confidence)
+
+        timestamps = batch.column("timestamp")
+        hours = pc.hour(timestamps).to_numpy(zero_copy_only=False)
+        self.hourly_inspections += np.bincount(hours, minlength=24)
+        self.hourly_defects += np.bincount(hours, weights=predicted, minlength=24).astype(np.int64)
+        latest = pc.max(timestamps).as_py()
+        if latest is not None and (self.last_timestamp is None or latest > self.last_timestamp):
+            self.last_timestamp = latest
+
+    def latency_quantile(self, quantile: float) -> float:
+        """Upper edge of the histogram bin holding the quantile (seconds)"""
+        if not self.latency_samples:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.latency_histogram), quantile * self.latency_samples))
+        return float(LATENCY_BIN_EDGES[min(index, len(LATENCY_BIN_EDGES) - 1)])
+
+    def to_kpis(self) -> Dict:
+        """KPIs in the same shape as ``KPIEngine.snapshot()`` plus an hourly breakdown"""
+        avg_time = self.latency_sum / self.latency_samples if self.latency_samples else 0.0
+        c = self.confusion
+        positives, negatives = c["tp"] + c["fn"], c["tn"] + c["fp"]
+
+        return {
+            "performance_metrics": {
+                "inference_speed_ms": avg_time * 1000,
+                "fps": 1.0 / avg_time if avg_time > 0 else 0,
+                "meets_requirements": 0 < avg_time < 0.1
+            },
+            "quality_metrics": {
+                "sensitivity": c["tp"] / positives if positives else 0,
+                "specificity": c["tn"] / negatives if negatives else 0,
+                "total_tests": sum(c.values())
+            },
+            "system_health": {
+                "last_updated": self.last_timestamp.isoformat() if self.last_timestamp else "Unknown",
+                "test_status": "daily_batch"
+            },
+            "production_metrics": {
+                "total_inspections": self.inspections,
+                "defects_detected": self.defects,
+                "defect_rate": self.defects / self.inspections if self.inspections else 0.0,
+                "defect_counts": dict(self.defect_counts),
+                "line_counts": dict(self.line_counts),
+                "latency_ms_quantiles": {
+                    f"p{int(q * 100)}": self.latency_quantile(q) * 1000 for q in REPORT_QUANTILES
+                },
+                "mean_confidence": self.confidence_sum / self.confidence_samples if self.confidence_samples else 0.0
+            },
+            "hourly": [
+                {
+                    "hour": hour,
+                    "inspections": int(self.hourly_inspections[hour]),
+                    "defects": int(self.hourly_defects[hour]),
+                }
+                for hour in range(24) if self.hourly_inspections[hour]
+            ]
+        }
+
+def _valid_values(column: pa.Array) -> np.ndarray:
+    return pc.drop_null(column).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+
+def _add_value_counts(counts: Dict[str, int], column: pa.Array):
+    for entry in pc.value_counts(pc.drop_null(column)).to_pylist():
+        counts[entry["values"]] = counts.get(entry["values"], 0) + entry["counts"]
+
+class DailyReportJob:
+    """Rebuilds today's report every ``interval_seconds`` on a background thread
+
+    When the date rolls over, the previous day's report is rebuilt once more
+    so it covers the whole day. Reports are written atomically, and
+    ``latest_report()`` serves the newest one without recomputing anything.
+    """
+
+    def __init__(self, bi, interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.bi = bi
+        self.interval_seconds = interval_seconds
+        self.chunk_rows = chunk_rows
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._build_lock = threading.Lock()
+        self._last_day: Optional[date] = None
+        self._latest: Optional[Dict] = None
+        self._latest_key = None
+        self.last_run: Optional[Dict] = None
+
+    def build(self, day: Optional[date] = None) -> Dict:
+        """Scan one day's partition in chunks and write its report"""
+        day = day or date.today()
+        with self._build_lock:
+            started = datetime.now()
+            aggregate = DailyAggregate()
+            for batch in self.bi.store.iter_batches(day, REPORT_COLUMNS, self.chunk_rows):
+                with stage("bi.report_chunk"):
+                    aggregate.add_batch(batch)
+
+            if aggregate.inspections:
+                kpis = aggregate.to_kpis()
+            else:
+                # No streamed results that day - fall back to the CV test baseline
+                kpis = self.bi.generate_kpi_dashboard()
+                if "error" in kpis:
+                    return kpis
+
+            report = self.bi.build_daily_report(kpis, report_date=day)
+            report["generation"] = {
+                "generated_at": datetime.now().isoformat(),
+                "inspections_scanned": aggregate.inspections,
+                "chunks": aggregate.batches,
+                "seconds": (datetime.now() - started).total_seconds()
+            }
+            write_json_atomic(report_path(self.bi.data_path, day), report)
+            self.last_run = report["generation"]
+            return report
+
+    def run_once(self, today: Optional[date] = None):
+        """Refresh today's report, finalising yesterday's after a date change"""
+        today = today or date.today()
+        if self._last_day is not None and self._last_day < today:
+            self.build(self._last_day)
+        self.build(today)
+        self._last_day = today
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Daily report generation failed: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def start(self) -> "DailyReportJob":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="daily-report-job", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def latest_report(self) -> Optional[Dict]:
+        """Newest precomputed report, re-read only when the file changes"""
+        path = latest_report_path(self.bi.data_path)
+        if path is None:
+            return None
+        key = (path, path.stat().st_mtime_ns)
+        if key != self._latest_key:
+            with open(path, "r") as f:
+                self._latest = json.load(f)
+            self._latest_key = key
+        return self._latest
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+🧮 Pre-aggregated KPI Rollups for Dashboard Time-Series
+Per-minute, hour, shift and day buckets maintained incrementally as results arrive
+"""
+
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from dashboards.inspection_store import InspectionStore, parse_timestamp
+
+# Finest to coarsest - shifts are three 8-hour blocks starting at 06:00
+RESOLUTIONS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "shift": timedelta(hours=8),
+    "day": timedelta(days=1),
+}
+SHIFT_START_HOUR = 6
+
+# How far back each rollup is kept (None = forever)
+DEFAULT_RETENTION = {
+    "minute": timedelta(days=2),
+    "hour": timedelta(days=90),
+    "shift": timedelta(days=730),
+    "day": None,
+}
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    """Start of the rollup bucket containing a timestamp"""
+    if resolution == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    if resolution == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if resolution == "shift":
+        shifted = timestamp - timedelta(hours=SHIFT_START_HOUR)
+        start_hour = shifted.hour - shifted.hour % 8
+        return shifted.replace(hour=start_hour, minute=0, second=0, microsecond=0) + timedelta(hours=SHIFT_START_HOUR)
+    if resolution == "day":
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown rollup resolution: {resolution}")
+
+class RollupBucket:
+    """Additive counters for one time bucket"""
+
+    __slots__ = ("inspections", "defects", "latency_sum", "latency_samples", "tp", "fp", "tn", "fn")
+
+    def __init__(self):
+        self.inspections = 0
+        self.defects = 0
+        self.latency_sum = 0.0
+        self.latency_samples = 0
+        self.tp = self.fp = self.tn = self.fn = 0
+
+    def add_event(self, event: Dict):
+        predicted_defective = event.get("defect_class", "none") != "none"
+        self.inspections += 1
+        self.defects += predicted_defective
+
+        latency = event.get("latency")
+        if latency is not None:
+            self.latency_sum += latency
+            self.latency_samples += 1
+
+        actual_defective = event.get("actual_defective")
+        if actual_defective is not None:
+            if actual_defective:
+                self.tp += predicted_defective
+                self.fn += not predicted_defective
+            else:
+                self.fp += predicted_defective
+                self.tn += not predicted_defective
+
+    def merge(self, other: "RollupBucket"):
+        for field in self.__slots__:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def to_point(self, start: datetime) -> Dict:
+        positives, negatives = self.tp + self.fn, self.tn + self.fp
+        avg_latency = self.latency_sum / self.latency_samples if self.latency_samples else 0.0
+        return {
+            "period": start,
+            "inspections": self.inspections,
+            "defect_rate": self.defects / self.inspections if self.inspections else 0.0,
+            "fps": 1.0 / avg_latency if avg_latency else 0.0,
+            "sensitivity": self.tp / positives if positives else None,
+            "specificity": self.tn / negatives if negatives else None,
+        }
+
+class RollupStore:
+    """Materialized KPI rollups at every resolution, updated in O(resolutions) per result"""
+
+    def __init__(self, retention: Optional[Dict[str, Optional[timedelta]]] = None):
+        self.retention = {**DEFAULT_RETENTION, **(retention or {})}
+        self._tables: Dict[str, Dict[datetime, RollupBucket]] = {name: {} for name in RESOLUTIONS}
+        self._latest: Optional[datetime] = None
+        self._since_prune = 0
+        self._lock = threading.Lock()
+
+    def add(self, event: Dict):
+        """Fold one inspection result into every rollup"""
+        self.add_many([event])
+
+    def add_many(self, events: List[Dict]):
+        """Fold a batch of inspection results into every rollup"""
+        with self._lock:
+            for event in events:
+                timestamp = parse_timestamp(event.get("timestamp"))
+                for resolution, table in self._tables.items():
+                    start = bucket_start(timestamp, resolution)
+                    bucket = table.get(start)
+                    if bucket is None:
+                        bucket = table[start] = RollupBucket()
+                    bucket.add_event(event)
+                if self._latest is None or timestamp > self._latest:
+                    self._latest = timestamp
+
+            self._since_prune += len(events)
+            if self._since_prune >= 10_000:
+                self._prune_locked()
+
+    def _prune_locked(self):
+        self._since_prune = 0
+        if self._latest is None:
+            return
+        for resolution, keep in self.retention.items():
+            if keep is None:
+                continue
+            cutoff = self._latest - keep
+            table = self._tables[resolution]
+            for start in [s for s in table if s < cutoff]:
+                del table[start]
+
+    def backfill(self, store: InspectionStore, start: date, end: date):
+        """Rebuild rollups for a date range from the columnar store
+
+        Every bucket overlapping the range is rebuilt from scratch, including
+        the night shift that starts the evening before ``start``, so
+        backfilling the same range again never double counts.
+        """
+        midnight = datetime.combine(start, datetime.min.time())
+        first = {name: bucket_start(midnight, name) for name in RESOLUTIONS}
+        minute_cutoff = None
+        if self.retention["minute"] is not None:
+            minute_cutoff = (datetime.combine(end, datetime.max.time()) - self.retention["minute"]).date()
+
+        hour_rows = [row for row in store.query_kpis(first["shift"].date(), end, granularity="hour")
+                     if row["period"] >= first["shift"]]
+        minute_rows = store.query_kpis(max(start, minute_cutoff or start), end, granularity="minute")
+
+        with self._lock:
+            for name in RESOLUTIONS:
+                self._tables[name] = {
+                    s: b for s, b in self._tables[name].items() if not first[name] <= s or s.date() > end
+                }
+            for row in minute_rows:
+                self._tables["minute"][row["period"]] = _bucket_from_row(row)
+            for row in hour_rows:
+                bucket = _bucket_from_row(row)
+                self._tables["hour"][row["period"]] = bucket
+                for resolution in ("shift", "day"):
+                    if row["period"] < first[resolution]:
+                        continue  # Only the night shift reaches back before ``start``
+                    coarse_start = bucket_start(row["period"], resolution)
+                    coarse = self._tables[resolution].setdefault(coarse_start, RollupBucket())
+                    coarse.merge(bucket)
+                if self._latest is None or row["period"] > self._latest:
+                    self._latest = row["period"]
+            self._prune_locked()
+
+    def available_since(self, resolution: str) -> Optional[datetime]:
+        """Oldest time a rollup still covers (None = unbounded)"""
+        keep = self.retention[resolution]
+        if keep is None or self._latest is None:
+            return None
+        return self._latest - keep
+
+    def select_resolution(self, start: datetime, end: datetime, max_points: int = 500,
+                          step: Optional[timedelta] = None) -> str:
+        """Coarsest rollup that still gives the requested resolution over the range
+
+        The requested resolution is ``step`` if given, otherwise the range split
+        into ``max_points``. Rollups whose retention does not reach back to
+        ``start`` are skipped.
+        """
+        step = step or (end - start) / max(max_points, 1)
+        covering = [
+            name for name in RESOLUTIONS
+            if self.available_since(name) is None or self.available_since(name) <= start
+        ]
+        fine_enough = [name for name in covering if RESOLUTIONS[name] <= step]
+        if fine_enough:
+            return fine_enough[-1]
+        return covering[0] if covering else "day"
+
+    def series(self, start: datetime, end: datetime, resolution: Optional[str] = None,
+               max_points: int = 500, step: Optional[timedelta] = None) -> Tuple[str, List[Dict]]:
+        """Time-series points for a range, choosing the rollup automatically"""
+        resolution = resolution or self.select_resolution(start, end, max_points, step)
+        first = bucket_start(start, resolution)
+        with self._lock:
+            table = self._tables[resolution]
+            points = [
+                bucket.to_point(bucket_start_time)
+                for bucket_start_time, bucket in sorted(table.items())
+                if first <= bucket_start_time <= end
+            ]
+        return resolution, points
+
+def _bucket_from_row(row: Dict) -> RollupBucket:
+    """Rebuild additive counters from an aggregate store row"""
+    bucket = RollupBucket()
+    bucket.inspections = row["inspections"]
+    bucket.defects = row["defects"]
+    bucket.latency_samples = row["latency_samples"]
+    bucket.latency_sum = (row["avg_latency"] or 0.0) * row["latency_samples"]
+    bucket.tp, bucket.fp, bucket.tn, bucket.fn = row["tp"], row["fp"], row["tn"], row["fn"]
+    return bucket
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+📉 Streaming Statistical Process Control for Tire Manufacturing
+X̄/R, EWMA and CUSUM control charts with Western Electric rule detection
+"""
+
+import math
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Shewhart constants by subgroup size: (A2, D3, D4, d2)
+SHEWHART_CONSTANTS = {
+    2: (1.880, 0.0, 3.267, 1.128),
+    3: (1.023, 0.0, 2.574, 1.693),
+    4: (0.729, 0.0, 2.282, 2.059),
+    5: (0.577, 0.0, 2.114, 2.326),
+    6: (0.483, 0.0, 2.004, 2.534),
+    7: (0.419, 0.076, 1.924, 2.704),
+    8: (0.373, 0.136, 1.864, 2.847),
+    9: (0.337, 0.184, 1.816, 2.970),
+    10: (0.308, 0.223, 1.777, 3.078),
+}
+
+ALL_DEFECTS = "all"
+
+class ControlChartSet:
+    """X̄/R, EWMA and CUSUM charts over one numeric series, O(1) per observation
+
+    The first ``baseline_subgroups`` subgroups (phase I) estimate the process
+    centre and sigma; after that the limits are frozen and every observation
+    is checked against them (phase II).
+    """
+
+    def __init__(self, subgroup_size: int = 5, baseline_subgroups: int = 20,
+                 ewma_lambda: float = 0.2, ewma_width: float = 3.0,
+                 cusum_k: float = 0.5, cusum_h: float = 5.0):
+        if subgroup_size not in SHEWHART_CONSTANTS:
+            raise ValueError(f"Subgroup size must be between 2 and 10, got {subgroup_size}")
+
+        self.subgroup_size = subgroup_size
+        self.baseline_subgroups = baseline_subgroups
+        self.ewma_lambda = ewma_lambda
+        self.ewma_width = ewma_width
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+
+        # Current subgroup
+        self._sum = 0.0
+        self._count = 0
+        self._min = math.inf
+        self._max = -math.inf
+
+        # Phase I accumulators
+        self._baseline_count = 0
+        self._baseline_mean_sum = 0.0
+        self._baseline_range_sum = 0.0
+        self._baseline_value_count = 0
+        self._baseline_value_sum = 0.0
+        self._baseline_value_sq_sum = 0.0
+
+        # Frozen limits (phase II)
+        self.center: Optional[float] = None
+        self.sigma: Optional[float] = None
+        self.r_bar: Optional[float] = None
+
+        self.ewma: Optional[float] = None
+        self.cusum_pos = 0.0
+        self.cusum_neg = 0.0
+        self._recent_z: Deque[float] = deque(maxlen=8)
+
+    @property
+    def ready(self) -> bool:
+        return self.center is not None and bool(self.sigma)
+
+    def limits(self) -> Dict:
+        """Current control limits (empty until the baseline is complete)"""
+        if not self.ready:
+            return {}
+        a2, d3, d4, _ = SHEWHART_CONSTANTS[self.subgroup_size]
+        ewma_spread = self.ewma_width * self.sigma * math.sqrt(self.ewma_lambda / (2 - self.ewma_lambda))
+        return {
+            "center": self.center,
+            "sigma": self.sigma,
+            "xbar_ucl": self.center + a2 * self.r_bar,
+            "xbar_lcl": self.center - a2 * self.r_bar,
+            "r_ucl": d4 * self.r_bar,
+            "r_lcl": d3 * self.r_bar,
+            "ewma_ucl": self.center + ewma_spread,
+            "ewma_lcl": self.center - ewma_spread,
+            "cusum_h": self.cusum_h * self.sigma,
+        }
+
+    def add(self, value: float) -> List[Tuple[str, str, float, str]]:
+        """Add one observation; returns signals as (chart, rule, value, direction)"""
+        signals = []
+        if self.ready:
+            signals.extend(self._check_individual(value))
+
+        self._sum += value
+        self._count += 1
+        self._min = min(self._min, value)
+        self._max = max(self._max, value)
+        if not self.ready:
+            self._baseline_value_count += 1
+            self._baseline_value_sum += value
+            self._baseline_value_sq_sum += value * value
+
+        if self._count == self.subgroup_size:
+            mean, spread = self._sum / self._count, self._max - self._min
+            self._sum, self._count, self._min, self._max = 0.0, 0, math.inf, -math.inf
+            if self.ready:
+                signals.extend(self._check_subgroup(mean, spread))
+            else:
+                self._add_baseline_subgroup(mean, spread)
+
+        return signals
+
+    def _add_baseline_subgroup(self, mean: float, spread: float):
+        self._baseline_count += 1
+        self._baseline_mean_sum += mean
+        self._baseline_range_sum += spread
+        if self._baseline_count < self.baseline_subgroups:
+            return
+
+        _, _, _, d2 = SHEWHART_CONSTANTS[self.subgroup_size]
+        self.center = self._baseline_mean_sum / self._baseline_count
+        self.r_bar = self._baseline_range_sum / self._baseline_count
+        sigma = self.r_bar / d2
+        if sigma <= 0:
+            # Ranges collapse for near-constant data; fall back to the sample deviation
+            n = self._baseline_value_count
+            variance = (self._baseline_value_sq_sum - self._baseline_value_sum ** 2 / n) / max(n - 1, 1)
+            sigma = math.sqrt(max(variance, 0.0))
+            self.r_bar = sigma * d2
+        self.sigma = sigma
+        self.ewma = self.center
+
+    def _check_individual(self, value: float) -> List[Tuple[str, str, float, str]]:
+        signals = []
+
+        self.ewma = self.ewma_lambda * value + (1 - self.ewma_lambda) * self.ewma
+        limits = self.limits()
+        if self.ewma > limits["ewma_ucl"]:
+            signals.append(("ewma", "ewma_limit", self.ewma, "up"))
+        elif self.ewma < limits["ewma_lcl"]:
+            signals.append(("ewma", "ewma_limit", self.ewma, "down"))
+
+        slack = self.cusum_k * self.sigma
+        self.cusum_pos = max(0.0, self.cusum_pos + value - self.center - slack)
+        self.cusum_neg = max(0.0, self.cusum_neg + self.center - value - slack)
+        if self.cusum_pos > limits["cusum_h"]:
+            signals.append(("cusum", "cusum_limit", self.cusum_pos, "up"))
+            self.cusum_pos = 0.0
+        if self.cusum_neg > limits["cusum_h"]:
+            signals.append(("cusum", "cusum_limit", self.cusum_neg, "down"))
+            self.cusum_neg = 0.0
+
+        return signals
+
+    def _check_subgroup(self, mean: float, spread: float) -> List[Tuple[str, str, float, str]]:
+        limits = self.limits()
+        signals = []
+
+        if spread > limits["r_ucl"]:
+            signals.append(("r", "range_limit", spread, "up"))
+
+        # Western Electric rules on subgroup means, in units of sigma(X̄)
+        sigma_xbar = (limits["xbar_ucl"] - self.center) / 3
+        z = (mean - self.center) / sigma_xbar if sigma_xbar > 0 else 0.0
+        self._recent_z.append(z)
+        recent = list(self._recent_z)
+        direction = "up" if z > 0 else "down"
+        side = 1 if z > 0 else -1
+
+        if abs(z) > 3:
+            signals.append(("xbar", "western_electric_1", mean, direction))
+        elif sum(1 for r in recent[-3:] if r * side > 2) >= 2 and abs(z) > 2:
+            signals.append(("xbar", "western_electric_2", mean, direction))
+        elif sum(1 for r in recent[-5:] if r * side > 1) >= 4 and abs(z) > 1:
+            signals.append(("xbar", "western_electric_3", mean, direction))
+        elif len(recent) == 8 and all(r * side > 0 for r in recent):
+            signals.append(("xbar", "western_electric_4", mean, direction))
+            self._recent_z.clear()
+
+        return signals
+
+class _RateWindow:
+    """Turns 0/1 indicators into proportions over fixed-size windows"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.hits = 0
+        self.count = 0
+
+    def add(self, hit: bool) -> Optional[float]:
+        self.hits += hit
+        self.count += 1
+        if self.count < self.size:
+            return None
+        rate = self.hits / self.count
+        self.hits = self.count = 0
+        return rate
+
+class SPCEngine:
+    """Control charts per production line and defect type
+
+    Per inspection it charts latency (ms) per line and, per line and defect
+    type, the defect rate over windows of ``rate_window`` inspections.
+    """
+
+    def __init__(self, subgroup_size: int = 5, baseline_subgroups: int = 20,
+                 rate_window: int = 50, max_alerts: int = 500, **chart_options):
+        self.subgroup_size = subgroup_size
+        self.baseline_subgroups = baseline_subgroups
+        self.rate_window = rate_window
+        self.chart_options = chart_options
+        self.charts: Dict[Tuple[str, str, str], ControlChartSet] = {}
+        self._rate_windows: Dict[Tuple[str, str], _RateWindow] = {}
+        self._defect_types: Dict[str, set] = {}
+        self.alerts: Deque[Dict] = deque(maxlen=max_alerts)
+        self._lock = threading.Lock()
+
+    def observe(self, line: str, defect_type: str, metric: str, value: float,
+                timestamp: Optional[str] = None) -> List[Dict]:
+        """Feed one value into the chart for (line, defect type, metric)"""
+        with self._lock:
+            return self._observe_locked(line, defect_type, metric, value, timestamp)
+
+    def observe_inspection(self, event: Dict) -> List[Dict]:
+        """Feed one inspection result into the line's charts"""
+        line = event.get("line") or "unknown"
+        timestamp = event.get("timestamp")
+        timestamp = timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp
+        defect_class = event.get("defect_class", "none")
+
+        with self._lock:
+            alerts = []
+            latency = event.get("latency")
+            if latency is not None:
+                alerts += self._observe_locked(line, ALL_DEFECTS, "latency_ms", latency * 1000, timestamp)
+
+            known = self._defect_types.setdefault(line, {ALL_DEFECTS})
+            if defect_class != "none":
+                known.add(defect_class)
+            for defect_type in known:
+                hit = defect_class != "none" if defect_type == ALL_DEFECTS else defect_class == defect_type
+                window = self._rate_windows.setdefault((line, defect_type), _RateWindow(self.rate_window))
+                rate = window.add(hit)
+                if rate is not None:
+                    alerts += self._observe_locked(line, defect_type, "defect_rate", rate, timestamp)
+            return alerts
+
+    def _observe_locked(self, line: str, defect_type: str, metric: str, value: float,
+                        timestamp: Optional[str]) -> List[Dict]:
+        key = (line, defect_type, metric)
+        chart = self.charts.get(key)
+        if chart is None:
+            chart = self.charts[key] = ControlChartSet(self.subgroup_size, self.baseline_subgroups,
+                                                       **self.chart_options)
+
+        new_alerts = []
+        for chart_name, rule, chart_value, direction in chart.add(value):
+            alert = {
+                "timestamp": timestamp or datetime.now().isoformat(),
+                "line": line,
+                "defect_type": defect_type,
+                "metric": metric,
+                "chart": chart_name,
+                "rule": rule,
+                "value": chart_value,
+                "direction": direction,
+            }
+            self.alerts.append(alert)
+            new_alerts.append(alert)
+        return new_alerts
+
+    @property
+    def monitoring(self) -> bool:
+        """True once at least one chart has frozen control limits"""
+        return any(chart.ready for chart in self.charts.values())
+
+    def recent_alerts(self, limit: int = 50) -> List[Dict]:
+        return list(self.alerts)[-limit:]
+
+    def chart_status(self) -> Dict:
+        """Limits and running statistics for every chart"""
+        with self._lock:
+            return {
+                "/".join(key): {
+                    "ready": chart.ready,
+                    "limits": chart.limits(),
+                    "ewma": chart.ewma,
+                    "cusum_pos": chart.cusum_pos,
+                    "cusum_neg": chart.cusum_neg,
+                }
+                for key, chart in self.charts.items()
+            }
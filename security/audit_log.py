@@ -0,0 +1,211 @@
+# 📝 BUFFERED SECURITY AUDIT LOG
+"""
+Background writer for security events: callers only enqueue, a single thread
+batches events into one write per flush and rotates/compresses the log file.
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tools.async_storage import DEFAULT_FSYNC_INTERVAL, FSYNC_POLICIES, fsync_directory
+
+security_logger = logging.getLogger("security")
+
+DEFAULT_AUDIT_LOG = Path("data/logs/security.json")
+ROTATED_TIME_FORMAT = "%Y%m%d-%H%M%S-%f"  # Rotation time in rotated file names
+_STOP = object()
+
+class AuditLogWriter:
+    """JSON-lines audit log written by a background thread
+
+    ``write`` never blocks: when the bounded queue is full the event is
+    counted as dropped. The file is rotated once it exceeds ``max_bytes`` or
+    is older than ``max_age_seconds``; rotated files are gzipped and only the
+    newest ``backup_count`` are kept. ``fsync`` follows the shared storage
+    policies: "interval" bounds what a power loss can take to about a second
+    of events without an fsync per batch.
+    """
+
+    def __init__(self, path: Path = DEFAULT_AUDIT_LOG, max_queue: int = 10_000, batch_size: int = 500,
+                 flush_interval: float = 1.0, max_bytes: int = 10 * 1024 * 1024,
+                 max_age_seconds: Optional[float] = 86_400, backup_count: int = 10, compress: bool = True,
+                 fsync: str = "interval", fsync_interval: float = DEFAULT_FSYNC_INTERVAL):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync} (expected one of {FSYNC_POLICIES})")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.backup_count = backup_count
+        self.compress = compress
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._file = None
+        self._opened_at = 0.0
+        self._unsynced = False
+        self._last_fsync = 0.0
+
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+
+    def write(self, event: Dict):
+        """Queue an event for writing (non-blocking)"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event is on disk; False on timeout"""
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Flush pending events and stop the writer thread"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def rotated_files(self) -> List[Path]:
+        """Rotated log files, oldest first"""
+        return sorted(self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}*"))
+
+    def stats(self) -> Dict:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+            "rotations": self.rotations,
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._sync(force=True)
+                self._rotate_if_needed()
+                continue
+
+            # Drain whatever else is waiting, up to one batch
+            while True:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+                if stopping or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                security_logger.error(f"Audit log write failed ({len(batch)} events lost): {e}")
+            finally:
+                for _ in range(len(batch) + stopping):
+                    self._queue.task_done()
+
+        if self._file is not None:
+            self._sync(force=True)
+            self._file.close()
+            self._file = None
+
+    def _write_batch(self, batch: List[Dict]):
+        if not batch:
+            return
+        self._rotate_if_needed()
+        if self._file is None:
+            self._open()
+        self._file.write("".join(json.dumps(event, default=str) + "\n" for event in batch))
+        self._file.flush()
+        self.written += len(batch)
+        self._unsynced = True
+        self._sync()
+
+    def _sync(self, force: bool = False):
+        """Fsync written events per policy; ``force`` syncs any backlog now (idle, rotation, close)"""
+        if not self._unsynced or self._file is None or self.fsync == "never":
+            return
+        now = time.monotonic()
+        if self.fsync == "always" or force or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._unsynced = False
+            self._last_fsync = now
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_at = self._first_event_time() or time.time()
+
+    def _first_event_time(self) -> Optional[float]:
+        """Timestamp of the oldest event in an existing file (its age for rotation)"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return float(json.loads(f.readline())["timestamp"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _rotate_if_needed(self):
+        if self._file is None:
+            if not self.path.exists():
+                return
+            self._open()
+
+        too_big = self._file.tell() >= self.max_bytes
+        too_old = self.max_age_seconds is not None and time.time() - self._opened_at >= self.max_age_seconds
+        if not (too_big or too_old) or self._file.tell() == 0:
+            return
+
+        self._sync(force=True)
+        self._file.close()
+        self._file = None
+        rotated = self.path.with_name(f"{self.path.stem}.{datetime.now().strftime(ROTATED_TIME_FORMAT)}{self.path.suffix}")
+        os.replace(self.path, rotated)
+        if self.compress:
+            with open(rotated, "rb") as source, gzip.open(f"{rotated}.gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+            rotated.unlink()
+        if self.fsync != "never":
+            fsync_directory(self.path.parent)
+        self.rotations += 1
+
+        for old in self.rotated_files()[:-self.backup_count or None]:
+            old.unlink()
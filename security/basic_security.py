@@ -5,13 +5,24 @@ Essential security features for tire manufacturing system
 """
 
 import hashlib
-import secrets
+import inspect
 import time
 import logging
+from collections import deque
 from functools import wraps
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 from pathlib import Path
-import json
+import sys
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from security.audit_log import AuditLogWriter
+from security.event_index import SecurityEventIndex, search_audit_log
+from security.rate_limiter import SlidingWindowRateLimiter
+from security.session_store import SessionStore
+from security.signed_tokens import SignedTokenManager
+from security.signatures import SignatureSet
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,11 +31,21 @@ security_logger = logging.getLogger("security")
 class BasicSecurityManager:
     """Basic security features - NOT production ready"""
     
-    def __init__(self):
-        self.failed_attempts = {}
+    def __init__(self, signatures: Optional[SignatureSet] = None,
+                 rate_limiter: Optional[SlidingWindowRateLimiter] = None,
+                 audit_writer: Optional[AuditLogWriter] = None, audit_buffer_size: int = 10_000,
+                 sessions: Optional[SessionStore] = None, signed_tokens: Optional[SignedTokenManager] = None):
+        # Compiled once: every input is scanned in a single pass
+        self.signatures = signatures if signatures is not None else SignatureSet.load_default()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else SlidingWindowRateLimiter.from_env()
         self.blocked_ips = set()
-        self.session_tokens = {}
-        self.audit_log = []
+        self.sessions = sessions if sessions is not None else SessionStore()
+        # Optional stateless mode: any worker holding the key validates tokens
+        self.signed_tokens = signed_tokens
+        # Recent events for reports; the full history goes to disk in the background
+        self.audit_log = deque(maxlen=audit_buffer_size)
+        self.audit_writer = audit_writer if audit_writer is not None else AuditLogWriter()
+        self.event_index = SecurityEventIndex()
         
     def validate_input(self, input_text: str, max_length: int = 1000) -> bool:
         """Basic input validation"""
@@ -36,58 +57,41 @@ class BasicSecurityManager:
             return False
         
         # Check for potential injection attempts
-        dangerous_patterns = [
-            "';", "--", "/*", "*/", "xp_", "sp_", "drop table", 
-            "delete from", "insert into", "update set", "<script",
-            "javascript:", "onload=", "onerror="
-        ]
-        
-        input_lower = input_text.lower()
-        for pattern in dangerous_patterns:
-            if pattern in input_lower:
-                self.log_security_event("potential_injection", {"pattern": pattern})
-                return False
+        match = self.signatures.match(input_text)
+        if match is not None:
+            pattern, category = match
+            self.log_security_event("potential_injection", {"pattern": pattern, "category": category})
+            return False
         
         return True
     
     def rate_limit(self, identifier: str, max_attempts: int = 10, time_window: int = 300):
-        """Basic rate limiting"""
-        current_time = time.time()
-        
-        if identifier in self.failed_attempts:
-            attempts = self.failed_attempts[identifier]
-            # Remove old attempts outside time window
-            attempts = [t for t in attempts if current_time - t < time_window]
-            self.failed_attempts[identifier] = attempts
-            
-            if len(attempts) >= max_attempts:
-                self.blocked_ips.add(identifier)
-                self.log_security_event("rate_limit_exceeded", {"identifier": identifier})
-                return False
+        """Record an attempt by ``identifier``; False once it exceeds the sliding-window limit"""
+        if not self.rate_limiter.allow(identifier, max_attempts, time_window):
+            self.blocked_ips.add(identifier)
+            self.log_security_event("rate_limit_exceeded", {"identifier": identifier})
+            return False
         
         return True
     
     def generate_session_token(self, user_id: str) -> str:
-        """Generate basic session token"""
-        token = secrets.token_urlsafe(32)
-        self.session_tokens[token] = {
-            "user_id": user_id,
-            "created": time.time(),
-            "expires": time.time() + 3600  # 1 hour
-        }
-        return token
+        """Generate session token (server-side session, or a signed token in stateless mode)"""
+        if self.signed_tokens is not None:
+            return self.signed_tokens.issue(user_id)
+        return self.sessions.create(user_id)
     
     def validate_session(self, token: str) -> Optional[str]:
         """Validate session token"""
-        if token not in self.session_tokens:
-            return None
-        
-        session = self.session_tokens[token]
-        if time.time() > session["expires"]:
-            del self.session_tokens[token]
-            return None
-        
-        return session["user_id"]
+        if self.signed_tokens is not None:
+            return self.signed_tokens.validate(token)
+        return self.sessions.validate(token)
+    
+    def revoke_session(self, token: str):
+        """End a session before it expires"""
+        if self.signed_tokens is not None:
+            self.signed_tokens.revoke(token)
+        else:
+            self.sessions.revoke(token)
     
     def log_security_event(self, event_type: str, details: Dict):
         """Log security events"""
@@ -97,27 +101,40 @@ class BasicSecurityManager:
             "details": details
         }
         self.audit_log.append(event)
+        self.event_index.add(event)
         security_logger.warning(f"Security event: {event_type} - {details}")
         
-        # Save to file
-        log_path = Path("data/logs/security.json")
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(log_path, "a") as f:
-            f.write(json.dumps(event) + "\n")
+        # Save to file (batched by the background writer)
+        self.audit_writer.write(event)
     
     def get_security_report(self) -> Dict:
-        """Generate security status report"""
+        """Generate security status report (O(buckets), independent of event volume)"""
         current_time = time.time()
-        recent_events = [e for e in self.audit_log if current_time - e["timestamp"] < 86400]  # Last 24h
+        counts = self.event_index.counts_since(86400, current_time)  # Last 24h
+        
+        # Last 10 events, walking back from the newest
+        last_events = []
+        for event in reversed(self.audit_log):
+            if current_time - event["timestamp"] >= 86400 or len(last_events) == 10:
+                break
+            last_events.append(event)
         
         return {
             "blocked_ips": len(self.blocked_ips),
-            "active_sessions": len(self.session_tokens),
-            "recent_security_events": len(recent_events),
-            "event_types": list(set(e["event_type"] for e in recent_events)),
-            "last_24h_events": recent_events[-10:]  # Last 10 events
+            "session_mode": "signed" if self.signed_tokens is not None else "server",
+            "active_sessions": len(self.sessions),
+            "recent_security_events": sum(counts.values()),
+            "event_types": sorted(counts),
+            "event_counts": counts,
+            "last_24h_events": last_events[::-1]
         }
+    
+    def search_security_events(self, event_type: Optional[str] = None, identifier: Optional[str] = None,
+                               start: Optional[float] = None, end: Optional[float] = None,
+                               limit: Optional[int] = None) -> List[Dict]:
+        """Forensic search over the on-disk audit logs, including rotated files"""
+        self.audit_writer.flush(timeout=5)
+        return search_audit_log(self.audit_writer, event_type, identifier, start, end, limit)
 
 # Global security manager instance
 security_manager = BasicSecurityManager()
@@ -140,14 +157,34 @@ def require_valid_input(max_length: int = 1000):
         return wrapper
     return decorator
 
-def rate_limited(max_attempts: int = 10):
-    """Decorator for rate limiting"""
+CLIENT_KEY_ARGUMENTS = ("client_id", "user_id", "session_token", "ip")
+
+def _client_key(signature: inspect.Signature, args: tuple, kwargs: Dict) -> str:
+    """First client identifier the call passes, positionally or by keyword"""
+    try:
+        arguments = {**kwargs, **signature.bind_partial(*args, **kwargs).arguments}
+    except TypeError:
+        arguments = kwargs  # The call itself is invalid and will fail as usual
+    for name in CLIENT_KEY_ARGUMENTS:
+        if arguments.get(name):
+            return str(arguments[name])
+    return "anonymous"
+
+def rate_limited(max_attempts: int = 10, time_window: int = 300,
+                 key_func: Optional[Callable[..., str]] = None):
+    """Decorator for rate limiting
+    
+    Each client gets its own bucket per function. The client is
+    ``key_func(*args, **kwargs)`` if given, otherwise the first of the
+    ``client_id``/``user_id``/``session_token``/``ip`` arguments passed.
+    """
     def decorator(func):
+        signature = inspect.signature(func)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Simple rate limiting by function name
-            func_name = func.__name__
-            if not security_manager.rate_limit(func_name, max_attempts):
+            client = key_func(*args, **kwargs) if key_func else _client_key(signature, args, kwargs)
+            if not security_manager.rate_limit(f"{func.__qualname__}:{client}", max_attempts, time_window):
                 raise Exception("Rate limit exceeded")
             
             return func(*args, **kwargs)
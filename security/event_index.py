@@ -0,0 +1,131 @@
+# 📇 SECURITY EVENT INDEX
+"""
+Time-bucketed security event counters for O(buckets) reporting, a per-type
+index of recent events, and forensic search over the rotated audit logs.
+"""
+
+import gzip
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional
+
+from security.audit_log import ROTATED_TIME_FORMAT, AuditLogWriter
+
+class SecurityEventIndex:
+    """Per-type event counts in a ring of fixed-width time buckets
+
+    Counting is O(1) per event and a report over any period up to
+    ``horizon_seconds`` touches at most ``horizon_seconds / bucket_seconds``
+    buckets, regardless of how many events were logged.
+    """
+
+    def __init__(self, bucket_seconds: int = 60, horizon_seconds: int = 86_400, recent_per_type: int = 100):
+        self.bucket_seconds = bucket_seconds
+        self.horizon_seconds = horizon_seconds
+        self._slots = horizon_seconds // bucket_seconds + 1
+        self._bucket_ids: List[Optional[int]] = [None] * self._slots
+        self._counts: List[Dict[str, int]] = [{} for _ in range(self._slots)]
+        self.recent_by_type: Dict[str, Deque[Dict]] = {}
+        self.recent_per_type = recent_per_type
+        self.totals: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, event: Dict):
+        event_type = event["event_type"]
+        bucket = int(event["timestamp"] // self.bucket_seconds)
+        slot = bucket % self._slots
+        with self._lock:
+            if self._bucket_ids[slot] != bucket:
+                self._bucket_ids[slot] = bucket
+                self._counts[slot] = {}
+            counts = self._counts[slot]
+            counts[event_type] = counts.get(event_type, 0) + 1
+            self.totals[event_type] = self.totals.get(event_type, 0) + 1
+            recent = self.recent_by_type.get(event_type)
+            if recent is None:
+                recent = self.recent_by_type[event_type] = deque(maxlen=self.recent_per_type)
+            recent.append(event)
+
+    def counts_since(self, seconds: float, now: Optional[float] = None) -> Dict[str, int]:
+        """Events per type over the last ``seconds`` (bucket resolution, capped at the horizon)"""
+        now = now or time.time()
+        newest = int(now // self.bucket_seconds)
+        oldest = int((now - min(seconds, self.horizon_seconds)) // self.bucket_seconds)
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for bucket_id, bucket_counts in zip(self._bucket_ids, self._counts):
+                if bucket_id is not None and oldest <= bucket_id <= newest:
+                    for event_type, count in bucket_counts.items():
+                        counts[event_type] = counts.get(event_type, 0) + count
+        return counts
+
+    def recent(self, event_type: str, limit: int = 10) -> List[Dict]:
+        """Latest events of one type"""
+        with self._lock:
+            return list(self.recent_by_type.get(event_type, ()))[-limit:]
+
+def _rotated_at(path: Path) -> Optional[float]:
+    """Rotation time encoded in a rotated log's name (an upper bound on its events)"""
+    stamp = path.name.split(".")[1]
+    try:
+        return datetime.strptime(stamp, ROTATED_TIME_FORMAT).timestamp()
+    except ValueError:
+        return None
+
+def _read_lines(path: Path) -> Iterator[str]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        yield from f
+
+def search_audit_log(writer: AuditLogWriter, event_type: Optional[str] = None,
+                     identifier: Optional[str] = None, start: Optional[float] = None,
+                     end: Optional[float] = None, limit: Optional[int] = None) -> List[Dict]:
+    """Forensic search over the rotated and current audit logs, oldest first
+
+    ``identifier`` matches any detail value (e.g. a rate-limited client).
+    Files entirely outside ``start``..``end`` are skipped using the rotation
+    time in their names, and lines are substring-filtered before being parsed.
+    """
+    files = [(path, _rotated_at(path)) for path in writer.rotated_files()]
+    files.append((writer.path, None))
+
+    # Substring prefilters, JSON-escaped the way the writer encodes them
+    needles = [json.dumps(value)[1:-1] for value in (event_type, identifier) if value is not None]
+
+    matches = []
+    previous_rotation = None
+    for path, rotated_at in files:
+        file_start, previous_rotation = previous_rotation, rotated_at or previous_rotation
+        if start is not None and rotated_at is not None and rotated_at < start:
+            continue
+        if end is not None and file_start is not None and file_start > end:
+            break
+        if not path.exists():
+            continue
+
+        for line in _read_lines(path):
+            if not all(needle in line for needle in needles):
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+
+            timestamp = event.get("timestamp", 0)
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp > end:
+                continue
+            if event_type is not None and event.get("event_type") != event_type:
+                continue
+            if identifier is not None and identifier not in (str(v) for v in event.get("details", {}).values()):
+                continue
+
+            matches.append(event)
+            if limit is not None and len(matches) >= limit:
+                return matches
+    return matches
@@ -0,0 +1,148 @@
+# 🚦 SLIDING-WINDOW RATE LIMITING
+"""
+Per-client sliding-window-counter rate limiting, O(1) time and memory per key.
+
+The estimate for the current window is ``previous * (1 - elapsed / window)
++ current``, which only needs two counters per key instead of a list of
+timestamps. Counters live in a backend: a local dict for a single process,
+or Redis so several workers enforce one global limit.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+REDIS_URL_ENV = "RATE_LIMIT_REDIS_URL"
+
+class _WindowCounter:
+    __slots__ = ("window", "window_index", "current", "previous", "last_seen")
+
+    def __init__(self, window: float, window_index: int, now: float):
+        self.window = window
+        self.window_index = window_index
+        self.current = 0
+        self.previous = 0
+        self.last_seen = now
+
+class InMemoryRateLimitBackend:
+    """Sliding-window counters in a local dict (one process)"""
+
+    def __init__(self):
+        self._counters: Dict[str, _WindowCounter] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def hit(self, key: str, limit: int, window: float, now: float) -> Tuple[bool, float]:
+        """Count one request if it fits under ``limit``; returns (allowed, estimate)"""
+        window_index = int(now // window)
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = _WindowCounter(window, window_index, now)
+            elif counter.window_index != window_index:
+                # Roll forward; anything older than the previous window no longer counts
+                counter.previous = counter.current if counter.window_index == window_index - 1 else 0
+                counter.current = 0
+                counter.window_index = window_index
+            counter.last_seen = now
+
+            elapsed = now / window - window_index
+            estimate = counter.previous * (1 - elapsed) + counter.current
+            if estimate >= limit:
+                return False, estimate
+            counter.current += 1
+            return True, estimate + 1
+
+    def sweep(self, now: float) -> int:
+        """Drop keys idle for two windows (their estimate is zero); returns how many were removed"""
+        with self._lock:
+            idle = [key for key, counter in self._counters.items() if now - counter.last_seen >= 2 * counter.window]
+            for key in idle:
+                del self._counters[key]
+        return len(idle)
+
+# Atomic check-and-increment over the current and previous window counters
+_REDIS_HIT_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local estimate = previous * tonumber(ARGV[1]) + current
+if estimate >= tonumber(ARGV[2]) then
+    return {0, tostring(estimate)}
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return {1, tostring(estimate + 1)}
+"""
+
+class RedisRateLimitBackend:
+    """Sliding-window counters shared through Redis by every worker
+
+    Each window is a separate key that expires after two windows, so idle
+    clients are swept by Redis itself.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit"):
+        self.client = client
+        self.prefix = prefix
+        self._hit = client.register_script(_REDIS_HIT_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisRateLimitBackend":
+        import redis
+
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def hit(self, key: str, limit: int, window: float, now: float) -> Tuple[bool, float]:
+        window_index = int(now // window)
+        elapsed = now / window - window_index
+        keys = [f"{self.prefix}:{key}:{window_index}", f"{self.prefix}:{key}:{window_index - 1}"]
+        allowed, estimate = self._hit(keys=keys, args=[1 - elapsed, limit, int(window * 2) + 1])
+        return bool(allowed), float(estimate)
+
+    def sweep(self, now: float) -> int:
+        return 0  # Keys expire on their own
+
+class SlidingWindowRateLimiter:
+    """Per-key request limits over a sliding window
+
+    Idle keys are swept from the backend at most every ``sweep_interval``
+    seconds, piggybacking on ``allow`` calls.
+    """
+
+    def __init__(self, limit: int = 10, window: float = 300.0, backend=None,
+                 sweep_interval: float = 60.0):
+        self.limit = limit
+        self.window = window
+        self.backend = backend if backend is not None else InMemoryRateLimitBackend()
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "SlidingWindowRateLimiter":
+        """Shared Redis backend when ``RATE_LIMIT_REDIS_URL`` is set, in-memory otherwise"""
+        url = os.getenv(REDIS_URL_ENV)
+        backend = RedisRateLimitBackend.from_url(url) if url else None
+        return cls(backend=backend, **kwargs)
+
+    def allow(self, key: str, limit: Optional[int] = None, window: Optional[float] = None) -> bool:
+        """Record a request for ``key``; False if it exceeds the limit"""
+        return self.check(key, limit, window)[0]
+
+    def check(self, key: str, limit: Optional[int] = None,
+              window: Optional[float] = None) -> Tuple[bool, float]:
+        """Like ``allow`` but also returns the estimated request count in the window"""
+        limit = limit or self.limit
+        window = window or self.window
+        now = time.time()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            self.sweep(now)
+        # Limits with different windows keep separate counters
+        return self.backend.hit(f"{key}:{window:g}", limit, window, now)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop counters that have been idle for two of their windows"""
+        return self.backend.sweep(now or time.time())
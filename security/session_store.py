@@ -0,0 +1,217 @@
+# 🎫 SESSION STORE
+"""
+Session storage with expiry sweeping, a memory cap and pluggable backends:
+in-memory for a single process, SQLite for several processes on one host.
+"""
+
+import heapq
+import secrets
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_SESSION_DB = Path("data/sessions.db")
+
+class InMemorySessionBackend:
+    """Sessions in a dict with a min-heap of expiry times
+
+    Expired sessions are popped off the heap in O(log n) each. When
+    ``max_sessions`` is reached, the sessions closest to expiry are evicted.
+    Deleted sessions leave stale heap entries, skipped when popped and
+    compacted away once they outnumber live sessions.
+    """
+
+    def __init__(self, max_sessions: int = 100_000):
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, Dict] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, token: str, session: Dict):
+        with self._lock:
+            self._sessions[token] = session
+            heapq.heappush(self._expiry_heap, (session["expires"], token))
+            while len(self._sessions) > self.max_sessions:
+                self._pop_earliest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        return self._sessions.get(token)
+
+    def delete(self, token: str):
+        with self._lock:
+            self._sessions.pop(token, None)
+            if len(self._expiry_heap) > 2 * len(self._sessions) + 64:
+                self._expiry_heap = [(e, t) for e, t in self._expiry_heap if self._is_live(e, t)]
+                heapq.heapify(self._expiry_heap)
+
+    def sweep(self, now: float) -> int:
+        """Remove every expired session; returns how many were removed"""
+        removed = 0
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                removed += self._pop_earliest()
+        return removed
+
+    def _is_live(self, expires: float, token: str) -> bool:
+        session = self._sessions.get(token)
+        return session is not None and session["expires"] == expires
+
+    def _pop_earliest(self) -> int:
+        expires, token = heapq.heappop(self._expiry_heap)
+        if self._is_live(expires, token):
+            del self._sessions[token]
+            return 1
+        return 0
+
+class SQLiteSessionBackend:
+    """Sessions in a local SQLite database shared by every process on the host
+
+    WAL mode lets readers proceed while another process writes; each thread
+    gets its own connection.
+    """
+
+    def __init__(self, path: Path = DEFAULT_SESSION_DB, max_sessions: int = 1_000_000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_sessions = max_sessions
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "token TEXT PRIMARY KEY, user_id TEXT NOT NULL, created REAL NOT NULL, expires REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires)")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM sessions").fetchone()[0]
+
+    def create(self, token: str, session: Dict):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO sessions (token, user_id, created, expires) VALUES (?, ?, ?, ?)",
+            (token, session["user_id"], session["created"], session["expires"])
+        )
+
+    def get(self, token: str) -> Optional[Dict]:
+        row = self._connection().execute(
+            "SELECT user_id, created, expires FROM sessions WHERE token = ?", (token,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"user_id": row[0], "created": row[1], "expires": row[2]}
+
+    def delete(self, token: str):
+        self._connection().execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+    def sweep(self, now: float) -> int:
+        """Remove expired sessions, then enforce the cap by earliest expiry"""
+        connection = self._connection()
+        removed = connection.execute("DELETE FROM sessions WHERE expires <= ?", (now,)).rowcount
+        excess = len(self) - self.max_sessions
+        if excess > 0:
+            removed += connection.execute(
+                "DELETE FROM sessions WHERE token IN (SELECT token FROM sessions ORDER BY expires LIMIT ?)",
+                (excess,)
+            ).rowcount
+        return removed
+
+class SessionStore:
+    """Session tokens with a fixed lifetime on a pluggable backend
+
+    Expired sessions are swept at most every ``sweep_interval`` seconds,
+    piggybacking on store calls, so abandoned sessions do not accumulate.
+    """
+
+    def __init__(self, backend=None, ttl_seconds: float = 3600, sweep_interval: float = 30.0):
+        self.backend = backend if backend is not None else InMemorySessionBackend()
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def create(self, user_id: str) -> str:
+        now = self._maybe_sweep()
+        token = secrets.token_urlsafe(32)
+        self.backend.create(token, {"user_id": user_id, "created": now, "expires": now + self.ttl_seconds})
+        return token
+
+    def validate(self, token: str) -> Optional[str]:
+        """User id for a live session, or None"""
+        now = self._maybe_sweep()
+        session = self.backend.get(token)
+        if session is None:
+            return None
+        if now > session["expires"]:
+            self.backend.delete(token)
+            return None
+        return session["user_id"]
+
+    def revoke(self, token: str):
+        self.backend.delete(token)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        return self.backend.sweep(now or time.time())
+
+    def _maybe_sweep(self) -> float:
+        now = time.time()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            self.sweep(now)
+        return now
+
+def _latency_summary(samples: List[float]) -> Dict:
+    samples = sorted(samples)
+    return {
+        "p50_us": statistics.median(samples) * 1e6,
+        "p99_us": samples[int(len(samples) * 0.99) - 1] * 1e6,
+    }
+
+def benchmark_session_backends(operations: int = 20_000) -> Dict[str, Dict]:
+    """Per-operation latency (p50/p99) of create, validate and revoke for each backend"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            "memory": InMemorySessionBackend(),
+            "sqlite": SQLiteSessionBackend(Path(tmp) / "sessions.db"),
+        }
+        for name, backend in backends.items():
+            store = SessionStore(backend)
+            timings = {"create": [], "validate": [], "revoke": []}
+            tokens = []
+            for i in range(operations):
+                start = time.perf_counter()
+                tokens.append(store.create(f"user-{i}"))
+                timings["create"].append(time.perf_counter() - start)
+            for token in tokens:
+                start = time.perf_counter()
+                store.validate(token)
+                timings["validate"].append(time.perf_counter() - start)
+            for token in tokens:
+                start = time.perf_counter()
+                store.revoke(token)
+                timings["revoke"].append(time.perf_counter() - start)
+            results[name] = {operation: _latency_summary(samples) for operation, samples in timings.items()}
+    return results
+
+if __name__ == "__main__":
+    print("🎫 Session store benchmark (per-operation latency)")
+    for backend, operations in benchmark_session_backends().items():
+        for operation, summary in operations.items():
+            print(f"  {backend:>6} {operation:<8} p50 {summary['p50_us']:7.1f} us  p99 {summary['p99_us']:7.1f} us")
@@ -0,0 +1,213 @@
+# ✍️ STATELESS SIGNED SESSION TOKENS
+"""
+Self-contained session tokens that any worker can validate with only a key:
+a compact binary payload (expiry, token id, user id) signed with HMAC-SHA256
+or Ed25519, plus a small Bloom filter of revoked token ids.
+"""
+
+import base64
+import hashlib
+import hmac
+import logging
+import math
+import os
+import secrets
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+TOKEN_VERSION_HMAC = 1
+TOKEN_VERSION_ED25519 = 2
+SIGNING_KEY_ENV = "SESSION_SIGNING_KEY"
+
+security_logger = logging.getLogger("security")
+
+# version (1 byte) | expires (uint32, epoch seconds) | token id (8 bytes) | user id (utf-8)
+_HEADER = struct.Struct(">BI8s")
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+class RevocationBloomFilter:
+    """Revoked token ids in two rotating Bloom filter generations
+
+    Tokens live at most ``ttl_seconds``, so a revocation only has to be
+    remembered that long: ids go into the current generation, lookups check
+    both, and the older generation is discarded every ``ttl_seconds``. A
+    false positive rejects a valid token (the user signs in again); a
+    revoked token is never accepted.
+    """
+
+    def __init__(self, capacity: int = 10_000, error_rate: float = 0.001, ttl_seconds: float = 900):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.ttl_seconds = ttl_seconds
+        self.bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self._current = bytearray((self.bits + 7) // 8)
+        self._previous = bytearray(len(self._current))
+        self._rotated_at = time.time()
+
+    def _positions(self, token_id: bytes):
+        digest = hashlib.blake2b(token_id, digest_size=16).digest()
+        first, second = struct.unpack(">QQ", digest)
+        # Double hashing: k positions from two independent 64-bit hashes
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def _rotate_if_needed(self):
+        if time.time() - self._rotated_at >= self.ttl_seconds:
+            self._previous, self._current = self._current, bytearray(len(self._current))
+            self._rotated_at = time.time()
+
+    def add(self, token_id: bytes):
+        self._rotate_if_needed()
+        for position in self._positions(token_id):
+            self._current[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, token_id: bytes) -> bool:
+        self._rotate_if_needed()
+        positions = self._positions(token_id)
+        return any(
+            all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+            for bits in (self._current, self._previous)
+        )
+
+    def to_bytes(self) -> bytes:
+        """Both generations, for broadcasting revocations to other workers"""
+        return bytes(self._current) + bytes(self._previous)
+
+    def merge(self, data: bytes):
+        """OR in another worker's filter (same capacity and error rate)"""
+        size = len(self._current)
+        for target, source in ((self._current, data[:size]), (self._previous, data[size:])):
+            for i, byte in enumerate(source):
+                target[i] |= byte
+
+class SignedTokenManager:
+    """Issues and validates stateless session tokens
+
+    Token: ``base64url(payload) + "." + base64url(signature)``. With HMAC,
+    every worker shares one secret; with Ed25519, only the issuer needs the
+    private key and validators can hold just the public key. Without a
+    secret (argument or ``SESSION_SIGNING_KEY``) an HMAC manager falls back
+    to a random per-process key, unless ``require_secret`` is set.
+    """
+
+    def __init__(self, secret: Optional[bytes] = None, ttl_seconds: float = 900,
+                 revocations: Optional[RevocationBloomFilter] = None,
+                 private_key=None, public_key=None, require_secret: bool = False):
+        self.ttl_seconds = ttl_seconds
+        self.revocations = revocations if revocations is not None else RevocationBloomFilter(ttl_seconds=ttl_seconds)
+        self.private_key = private_key
+        self.public_key = public_key or (private_key.public_key() if private_key is not None else None)
+        self.version = TOKEN_VERSION_ED25519 if self.public_key is not None else TOKEN_VERSION_HMAC
+        self.secret = None
+        if self.version == TOKEN_VERSION_HMAC:
+            self.secret = secret or _secret_from_env()
+            if self.secret is None:
+                if require_secret:
+                    raise RuntimeError(f"{SIGNING_KEY_ENV} must be set so every worker signs with the same key")
+                security_logger.warning(f"{SIGNING_KEY_ENV} not set: using a random key, so tokens "
+                                        "issued here will not validate in any other process")
+                self.secret = secrets.token_bytes(32)
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "SignedTokenManager":
+        """HMAC manager for several workers: the key must come from ``SESSION_SIGNING_KEY``"""
+        return cls(require_secret=True, **kwargs)
+
+    @classmethod
+    def ed25519(cls, private_key=None, public_key=None, **kwargs) -> "SignedTokenManager":
+        """Ed25519-signed tokens; generates a key pair when none is given"""
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+        if private_key is None and public_key is None:
+            private_key = Ed25519PrivateKey.generate()
+        return cls(private_key=private_key, public_key=public_key, **kwargs)
+
+    def issue(self, user_id: str) -> str:
+        expires = int(time.time() + self.ttl_seconds)
+        payload = _HEADER.pack(self.version, expires, secrets.token_bytes(8)) + user_id.encode("utf-8")
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def validate(self, token: str) -> Optional[str]:
+        """User id if the token is authentic, unexpired and not revoked"""
+        payload = self._verified_payload(token)
+        if payload is None:
+            return None
+        version, expires, token_id = _HEADER.unpack_from(payload)
+        if version != self.version or time.time() > expires or token_id in self.revocations:
+            return None
+        return payload[_HEADER.size:].decode("utf-8")
+
+    def revoke(self, token: str):
+        payload = self._verified_payload(token)
+        if payload is not None:
+            self.revocations.add(_HEADER.unpack_from(payload)[2])
+
+    def _sign(self, payload: bytes) -> bytes:
+        if self.version == TOKEN_VERSION_HMAC:
+            return hmac.digest(self.secret, payload, "sha256")
+        if self.private_key is None:
+            raise ValueError("This token manager only holds a public key and cannot issue tokens")
+        return self.private_key.sign(payload)
+
+    def _verified_payload(self, token: str) -> Optional[bytes]:
+        try:
+            encoded_payload, encoded_signature = token.split(".", 1)
+            payload, signature = _b64decode(encoded_payload), _b64decode(encoded_signature)
+        except (ValueError, TypeError):
+            return None
+        if len(payload) < _HEADER.size:
+            return None
+
+        if self.version == TOKEN_VERSION_HMAC:
+            if not hmac.compare_digest(hmac.digest(self.secret, payload, "sha256"), signature):
+                return None
+        else:
+            from cryptography.exceptions import InvalidSignature
+
+            try:
+                self.public_key.verify(signature, payload)
+            except InvalidSignature:
+                return None
+        return payload
+
+def _secret_from_env() -> Optional[bytes]:
+    """Shared HMAC secret for all workers (hex) from ``SESSION_SIGNING_KEY``"""
+    value = os.getenv(SIGNING_KEY_ENV)
+    return bytes.fromhex(value) if value else None
+
+def benchmark_token_validation(operations: int = 20_000) -> Dict[str, float]:
+    """Microseconds per validation: HMAC and Ed25519 tokens vs. the in-memory session store"""
+    from security.session_store import SessionStore
+
+    results = {}
+    candidates = {"hmac": SignedTokenManager(secrets.token_bytes(32)), "ed25519": SignedTokenManager.ed25519()}
+    for name, manager in candidates.items():
+        token = manager.issue("benchmark-user")
+        start = time.perf_counter()
+        for _ in range(operations):
+            manager.validate(token)
+        results[name] = (time.perf_counter() - start) / operations * 1e6
+
+    store = SessionStore()
+    token = store.create("benchmark-user")
+    start = time.perf_counter()
+    for _ in range(operations):
+        store.validate(token)
+    results["session_store"] = (time.perf_counter() - start) / operations * 1e6
+    return results
+
+if __name__ == "__main__":
+    print("✍️ Token validation benchmark")
+    for name, micros in benchmark_token_validation().items():
+        print(f"  {name:>13}: {micros:6.2f} us per validation")
@@ -3,45 +3,301 @@
 🧪 Computer Vision Testing Suite for Tire Defect Detection
 """
 
-import json
+import copy
+import io
+import sys
 import time
 import numpy as np
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dashboards.kpi_channel import INSPECTIONS_TOPIC, KPIBroker
+from testing.preprocess_cache import PreprocessCache
+from tools.async_storage import get_storage
+from tools.telemetry import stage
+
+# Precision modes selectable for CPU-only inspection stations
+PRECISION_MODES = ("fp32", "bf16", "int8_dynamic", "int8_static")
+
+SAMPLE_IMAGE_DIR = Path("testing/sample_images")
+DEFAULT_MODEL_PATH = Path("data/models/tire_defect_detector.pt")
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+IMAGE_SIZE = 224
+# Part of the preprocessing cache key - bump "version" when preprocessing changes
+PREPROCESS_CONFIG = {"size": IMAGE_SIZE, "mode": "RGB", "scale": 1 / 255, "layout": "CHW", "version": 1}
+MAX_ACCURACY_DROP = 0.01  # Accept at most 1 point of accuracy loss vs fp32
 
 class TireDefectTester:
-    def __init__(self):
+    def __init__(self, precision: str = "fp32", model_path: Path = DEFAULT_MODEL_PATH,
+                 use_preprocess_cache: bool = True):
+        if precision not in PRECISION_MODES:
+            raise ValueError(f"Unknown precision mode: {precision} (expected one of {PRECISION_MODES})")
+
+        self.precision = precision
+        self.model_path = Path(model_path)
         self.test_results = {}
+        self.preprocess_cache = PreprocessCache() if use_preprocess_cache else None
+        self._base_model = None
+        self._detectors = {}
         
     def create_sample_test_images(self):
         """Create sample test images for demonstration"""
-        test_dir = Path("testing/sample_images")
+        test_dir = SAMPLE_IMAGE_DIR
         test_dir.mkdir(parents=True, exist_ok=True)
         
         print(f"✅ Sample test directory created: {test_dir}")
         return test_dir
     
-    def test_inference_speed(self, iterations: int = 10) -> dict:
+    def load_sample_images(self) -> List[Tuple[Path, int]]:
+        """List labelled sample images (1 = defective, 0 = good)"""
+        samples = []
+        for label_dir, label in (("defective", 1), ("good", 0)):
+            directory = SAMPLE_IMAGE_DIR / label_dir
+            if not directory.exists():
+                continue
+            for image_path in sorted(directory.iterdir()):
+                if image_path.suffix.lower() in IMAGE_EXTENSIONS:
+                    samples.append((image_path, label))
+        return samples
+
+    def preprocess_image(self, image_path: Path) -> np.ndarray:
+        """Decode, resize and normalize an image into a CHW float32 array
+
+        Repeated evaluation passes are served from the preprocessing cache,
+        skipping decode and resize for images whose bytes are unchanged.
+        """
+        with stage("cv.preprocess"):
+            if self.preprocess_cache is None:
+                return _decode_and_resize(Path(image_path).read_bytes())
+            return self.preprocess_cache.get_or_compute(image_path, PREPROCESS_CONFIG, _decode_and_resize)
+
+    def _load_base_model(self):
+        """Load the fp32 detector, falling back to the reference network"""
+        if self._base_model is not None:
+            return self._base_model
+
+        import torch
+
+        if self.model_path.exists():
+            model = torch.load(self.model_path, map_location="cpu", weights_only=False)
+        else:
+            # Untrained reference network so precision modes can be compared
+            # on hardware before the production weights are available
+            torch.manual_seed(0)
+            model = torch.nn.Sequential(
+                torch.nn.Conv2d(3, 16, kernel_size=3, stride=2, padding=1),
+                torch.nn.ReLU(),
+                torch.nn.Conv2d(16, 32, kernel_size=3, stride=2, padding=1),
+                torch.nn.ReLU(),
+                torch.nn.AdaptiveAvgPool2d(1),
+                torch.nn.Flatten(),
+                torch.nn.Linear(32, 2),
+            )
+
+        self._base_model = model.eval()
+        return self._base_model
+
+    def _calibration_batches(self, limit: int = 32) -> Tuple[List[np.ndarray], str]:
+        """Preprocessed calibration inputs from the sample images"""
+        samples = self.load_sample_images()[:limit]
+        if samples:
+            return [self.preprocess_image(path)[None] for path, _ in samples], "sample_images"
+
+        # No sample images yet - calibrate on noise so the mode can still be timed
+        rng = np.random.default_rng(0)
+        batches = [rng.random((1, 3, IMAGE_SIZE, IMAGE_SIZE), dtype=np.float32) for _ in range(8)]
+        return batches, "synthetic"
+
+    def build_detector(self, precision: Optional[str] = None) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+        """Build a predict function returning defect probabilities for a precision mode
+
+        Returns None when PyTorch is unavailable or the mode is not supported on this CPU.
+        """
+        precision = precision or self.precision
+        if precision in self._detectors:
+            return self._detectors[precision]
+
+        try:
+            import torch
+        except ImportError:
+            return None
+
+        model = self._load_base_model()
+        autocast_bf16 = False
+
+        if precision == "bf16":
+            if not _cpu_supports_bf16(torch):
+                self._detectors[precision] = None
+                return None
+            autocast_bf16 = True
+        elif precision == "int8_dynamic":
+            model = torch.ao.quantization.quantize_dynamic(
+                copy.deepcopy(model), {torch.nn.Linear}, dtype=torch.qint8
+            )
+        elif precision == "int8_static":
+            from torch.ao.quantization import get_default_qconfig_mapping
+            from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+            batches, _ = self._calibration_batches()
+            batches = [np.array(batch) for batch in batches]
+            example = torch.from_numpy(batches[0])
+            prepared = prepare_fx(copy.deepcopy(model), get_default_qconfig_mapping("x86"), (example,))
+            with torch.inference_mode():
+                for batch in batches:
+                    prepared(torch.from_numpy(batch))
+            model = convert_fx(prepared)
+
+        def predict(batch: np.ndarray) -> np.ndarray:
+            # Cached tensors are read-only memory maps; torch needs a writable buffer
+            batch = batch if batch.flags.writeable else np.array(batch)
+            with stage("cv.inference"), torch.inference_mode(), \
+                    torch.autocast("cpu", dtype=torch.bfloat16, enabled=autocast_bf16):
+                logits = model(torch.from_numpy(batch))
+                return torch.softmax(logits.float(), dim=1)[:, 1].numpy()
+
+        self._detectors[precision] = predict
+        return predict
+
+    def inspect_image(self, image_path: Path, line: Optional[str] = None, shift: Optional[str] = None,
+                      actual_defective: Optional[bool] = None, broker: Optional[KPIBroker] = None) -> Dict:
+        """Inspect one tire image, publishing the result to the KPI channel if a broker is given"""
+        detector = self.build_detector()
+        if detector is None:
+            raise RuntimeError(f"Detector unavailable for precision mode {self.precision}")
+
+        start_time = time.time()
+        probability = float(detector(self.preprocess_image(image_path)[None])[0])
+        latency = time.time() - start_time
+
+        result = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "line": line,
+            "shift": shift,
+            "defect_class": "defect" if probability >= 0.5 else "none",
+            "confidence": probability if probability >= 0.5 else 1.0 - probability,
+            "latency": latency,
+            "actual_defective": actual_defective,
+            "image": str(image_path)
+        }
+
+        if broker is not None:
+            broker.publish(INSPECTIONS_TOPIC, result)
+        return result
+
+    def test_inference_speed(self, iterations: int = 10, precision: Optional[str] = None) -> dict:
         """Test inference speed"""
+        precision = precision or self.precision
+        detector = self.build_detector(precision)
+
+        if detector is not None:
+            batches, _ = self._calibration_batches(limit=1)
+            sample = np.array(batches[0])
+            detector(sample)  # Warm-up run
+
         times = []
         for _ in range(iterations):
             start_time = time.time()
-            # Simulate processing
-            time.sleep(0.001)  # 1ms simulation
+            if detector is not None:
+                detector(sample)
+            else:
+                # Simulate processing
+                time.sleep(0.001)  # 1ms simulation
             times.append(time.time() - start_time)
         
         avg_time = np.mean(times)
         
         performance_metrics = {
+            "precision": precision,
+            "simulated": detector is None,
             "average_inference_time": float(avg_time),
             "fps": float(1.0 / avg_time if avg_time > 0 else 0),
             "meets_100ms_requirement": bool(avg_time < 0.1)
         }
         
-        print(f"🚀 Inference Performance:")
+        print(f"🚀 Inference Performance ({precision}):")
         print(f"   Average time: {avg_time:.3f}s")
         print(f"   FPS: {performance_metrics['fps']:.1f}")
         
         return performance_metrics
+
+    def evaluate_accuracy(self, precision: Optional[str] = None) -> Optional[dict]:
+        """Measure accuracy on the labelled sample images"""
+        detector = self.build_detector(precision)
+        samples = self.load_sample_images()
+        if detector is None or not samples:
+            return None
+
+        predictions = [bool(detector(self.preprocess_image(path)[None])[0] >= 0.5) for path, _ in samples]
+        labels = [bool(label) for _, label in samples]
+
+        true_positive = sum(p and l for p, l in zip(predictions, labels))
+        true_negative = sum(not p and not l for p, l in zip(predictions, labels))
+        positives = sum(labels)
+        negatives = len(labels) - positives
+
+        return {
+            "sensitivity": true_positive / positives if positives else 0.0,
+            "specificity": true_negative / negatives if negatives else 0.0,
+            "accuracy": (true_positive + true_negative) / len(labels),
+            "total_tests": len(labels)
+        }
+
+    def compare_precision_modes(self, iterations: int = 10, max_accuracy_drop: float = MAX_ACCURACY_DROP,
+                                measured: Optional[Dict[str, dict]] = None) -> dict:
+        """Report accuracy delta versus latency gain for every precision mode
+
+        ``measured`` maps a precision to results the caller already has
+        (``performance_metrics`` and ``accuracy_results``); those are reused.
+        Modes only timed by the simulation are unsupported and never
+        recommended; fp32 keeps its simulated timings as the baseline.
+        """
+        measured = measured or {}
+        modes = {}
+        for precision in PRECISION_MODES:
+            if precision in measured:
+                result = dict(measured[precision])
+            elif precision == "fp32" or self.build_detector(precision) is not None:
+                result = {
+                    "performance_metrics": self.test_inference_speed(iterations, precision),
+                    "accuracy_results": self.evaluate_accuracy(precision)
+                }
+            else:
+                result = {}
+
+            result["supported"] = bool(result) and not result["performance_metrics"]["simulated"]
+            modes[precision] = result if result["supported"] or precision == "fp32" else {"supported": False}
+
+        baseline = modes["fp32"]
+        baseline_time = baseline["performance_metrics"]["average_inference_time"]
+        baseline_accuracy = (baseline["accuracy_results"] or {}).get("accuracy")
+
+        for result in modes.values():
+            if "performance_metrics" not in result:
+                continue
+            avg_time = result["performance_metrics"]["average_inference_time"]
+            accuracy = (result["accuracy_results"] or {}).get("accuracy")
+            result["latency_gain"] = float(baseline_time / avg_time) if avg_time > 0 else 0.0
+            result["accuracy_delta"] = (
+                accuracy - baseline_accuracy if accuracy is not None and baseline_accuracy is not None else None
+            )
+
+        # Cheapest mode = fastest one that keeps the 100ms budget and accuracy
+        eligible = [
+            (result["performance_metrics"]["average_inference_time"], precision)
+            for precision, result in modes.items()
+            if result["supported"]
+            and result["performance_metrics"]["meets_100ms_requirement"]
+            and (result["accuracy_delta"] is None or result["accuracy_delta"] >= -max_accuracy_drop)
+        ]
+
+        return {
+            "modes": modes,
+            "recommended_mode": min(eligible)[1] if eligible else None,
+            "max_accuracy_drop": max_accuracy_drop
+        }
     
     def generate_test_report(self) -> dict:
         """Generate comprehensive test report"""
@@ -52,9 +308,15 @@ class TireDefectTester:
         
         # Run performance tests
         performance_results = self.test_inference_speed()
+        measured_accuracy = self.evaluate_accuracy()
+        # Reuse this run for its mode rather than benchmarking that mode twice
+        precision_results = self.compare_precision_modes(measured={self.precision: {
+            "performance_metrics": performance_results,
+            "accuracy_results": measured_accuracy
+        }})
         
-        # Simulate accuracy results
-        accuracy_results = {
+        # Use measured accuracy when labelled samples exist, otherwise simulate
+        accuracy_results = measured_accuracy or {
             "sensitivity": 0.92,
             "specificity": 0.89,
             "total_tests": 50
@@ -64,19 +326,35 @@ class TireDefectTester:
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "performance_metrics": performance_results,
             "accuracy_results": accuracy_results,
+            "precision_modes": precision_results,
+            "preprocess_cache": self.preprocess_cache.stats() if self.preprocess_cache else None,
             "test_status": "completed"
         }
         
-        # Save report
+        # Save report (atomic, through the shared writer; raises if the write failed)
         report_path = Path("data/reports/cv_test_report.json")
-        report_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(report_path, 'w') as f:
-            json.dump(full_report, f, indent=2)
+        get_storage().submit_json(report_path, full_report).result()
         
         print(f"📄 Test report saved to: {report_path}")
         return full_report
 
+def _decode_and_resize(raw_bytes: bytes) -> np.ndarray:
+    """Decode raw image bytes into a normalized CHW float32 array"""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(raw_bytes)) as image:
+        image = image.convert(PREPROCESS_CONFIG["mode"]).resize((IMAGE_SIZE, IMAGE_SIZE))
+        array = np.asarray(image, dtype=np.float32) * np.float32(PREPROCESS_CONFIG["scale"])
+
+    return np.ascontiguousarray(array.transpose(2, 0, 1))
+
+def _cpu_supports_bf16(torch) -> bool:
+    """Check for native bf16 kernels on this CPU"""
+    try:
+        return bool(torch.backends.mkldnn.is_available() and torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
 def run_cv_tests():
     """Main function to run CV tests"""
     tester = TireDefectTester()
@@ -94,7 +372,24 @@ def run_cv_tests():
     print(f"🎯 Sensitivity: {acc['sensitivity']:.2%}")
     print(f"🎯 Specificity: {acc['specificity']:.2%}")
     
+    print("\n⚖️ Precision Modes (accuracy delta vs latency gain):")
+    for precision, result in report["precision_modes"]["modes"].items():
+        if not result["supported"]:
+            print(f"   {precision}: not supported on this CPU")
+            continue
+        delta = result["accuracy_delta"]
+        delta_text = f"{delta:+.2%}" if delta is not None else "n/a"
+        print(f"   {precision}: {result['latency_gain']:.2f}x faster, accuracy {delta_text}")
+    print(f"✅ Recommended mode: {report['precision_modes']['recommended_mode']}")
+
     return report
 
+def check_cv_inference() -> Dict:
+    """The detector builds and meets the 100 ms per-image budget"""
+    metrics = TireDefectTester().test_inference_speed(iterations=3)
+    if not metrics["simulated"] and not metrics["meets_100ms_requirement"]:
+        raise AssertionError(f"Average inference {metrics['average_inference_time']:.3f}s exceeds 100 ms")
+    return metrics
+
 if __name__ == "__main__":
     run_cv_tests()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+📈 Load Testing Harness for the Tire Manufacturing RAG System
+Open-loop query replay against the in-process orchestrator, the daemon or the HTTP API
+"""
+
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+REPORT_DIR = Path("data/reports")
+REPORT_PERCENTILES = (50, 90, 99, 99.9)
+
+SYNTHETIC_TEMPLATES = (
+    ("Why are {defect} increasing on {line}?", "auto"),
+    ("Recommend curing settings to reduce {defect} on {line}", "auto"),
+    ("Summarize {defect} defects for {line} this shift", "traditional_rag"),
+    ("How do press temperature and {defect} relate on {line}?", "agentic_rag"),
+    ("Which suppliers are linked to {defect} on {line}?", "graph_rag"),
+)
+SYNTHETIC_DEFECTS = ("cracks", "bubbles", "sidewall bulges", "tread separation")
+SYNTHETIC_LINES = ("Line 1", "Line 2", "Line 3", "Line 4")
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with bounded relative error
+
+    Bucket ``i`` holds values up to ``min_value * (1 + precision) ** i``, so
+    percentiles are accurate to ``precision`` (2% by default) from 10 us to
+    minutes in a few hundred buckets, like HdrHistogram.
+    """
+
+    def __init__(self, min_value: float = 1e-5, precision: float = 0.02):
+        self.min_value = min_value
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        index = max(0, math.ceil(math.log(max(seconds, self.min_value) / self.min_value) / self._log_base))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.max = max(self.max, seconds)
+
+    def _upper_bound(self, index: int) -> float:
+        return self.min_value * (1 + self.precision) ** index
+
+    def percentile(self, percent: float) -> float:
+        if not self.total:
+            return 0.0
+        target = math.ceil(self.total * percent / 100)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.total,
+            **{f"p{p:g}": self.percentile(p) for p in REPORT_PERCENTILES},
+            "max": self.max,
+        }
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """(upper bound seconds, count) for every non-empty bucket"""
+        return [(self._upper_bound(index), self.counts[index]) for index in sorted(self.counts)]
+
+def load_query_mix(path: Path) -> List[Dict]:
+    """Queries from a JSON-lines file (``query``, or ``title``/``body`` records) or plain text lines
+
+    Optional per-record ``query_type`` and ``weight`` fields shape the mix.
+    """
+    mix = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = line
+        if isinstance(record, str):
+            mix.append({"query": record, "query_type": "auto", "weight": 1.0})
+            continue
+        text = record.get("query") or record.get("title") or record.get("body")
+        if text:
+            mix.append({
+                "query": text,
+                "query_type": record.get("query_type", "auto"),
+                "weight": float(record.get("weight", 1.0)),
+            })
+    if not mix:
+        raise ValueError(f"No queries found in {path}")
+    return mix
+
+def synthetic_query_mix(size: int = 200, seed: int = 0) -> List[Dict]:
+    """Templated manufacturing queries across defects, lines and query types"""
+    rng = random.Random(seed)
+    mix = []
+    for _ in range(size):
+        template, query_type = rng.choice(SYNTHETIC_TEMPLATES)
+        query = template.format(defect=rng.choice(SYNTHETIC_DEFECTS), line=rng.choice(SYNTHETIC_LINES))
+        mix.append({"query": query, "query_type": query_type, "weight": 1.0})
+    return mix
+
+class InProcessTarget:
+    """Queries the orchestrator on the load generator's own event loop"""
+
+    name = "inprocess"
+
+    def __init__(self, orchestrator):
+        self.orchestrator = orchestrator
+
+    async def setup(self):
+        if self.orchestrator.system_status != "ready":
+            await self.orchestrator.initialize_system(show_progress=False)
+
+    async def send(self, query: str, query_type: str) -> Dict:
+        return await self.orchestrator.process_query(query, query_type)
+
+    async def close(self):
+        self.orchestrator.close()
+
+class DaemonTarget:
+    """Queries the warm daemon over its Unix socket (one connection per request)"""
+
+    name = "daemon"
+
+    def __init__(self, socket_path: Optional[Path] = None):
+        from api.daemon import DEFAULT_SOCKET_PATH
+
+        self.socket_path = Path(socket_path or DEFAULT_SOCKET_PATH)
+
+    async def setup(self):
+        from api.daemon import daemon_running
+
+        if not daemon_running(self.socket_path):
+            raise RuntimeError(f"No daemon listening on {self.socket_path}")
+
+    async def send(self, query: str, query_type: str) -> Dict:
+        reader, writer = await asyncio.open_unix_connection(str(self.socket_path))
+        try:
+            request = {"op": "query", "query": query, "query_type": query_type}
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            return json.loads(await reader.readline())
+        finally:
+            writer.close()
+
+    async def close(self):
+        pass
+
+class HttpTarget:
+    """Queries ``POST /query`` on the HTTP API"""
+
+    name = "http"
+
+    def __init__(self, base_url: str = "http://127.0.0.1:8000", timeout: float = 30.0):
+        self.url = f"{base_url.rstrip('/')}/query"
+        self.timeout = timeout
+        self.client = None
+
+    async def setup(self):
+        import httpx
+
+        # No connection cap: an open-loop test must not queue inside the client
+        self.client = httpx.AsyncClient(timeout=self.timeout, limits=httpx.Limits(max_connections=None))
+
+    async def send(self, query: str, query_type: str) -> Dict:
+        response = await self.client.post(self.url, json={"query": query, "query_type": query_type})
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+
+def _arrival_times(rate: float, duration: float, arrival: str, rng: random.Random) -> List[float]:
+    """Intended send times (seconds from start) for an open-loop schedule"""
+    if arrival == "uniform":
+        return [i / rate for i in range(int(rate * duration))]
+    if arrival != "poisson":
+        raise ValueError(f"Unknown arrival process: {arrival} (expected 'uniform' or 'poisson')")
+    times, t = [], rng.expovariate(rate)
+    while t < duration:
+        times.append(t)
+        t += rng.expovariate(rate)
+    return times
+
+async def run_load(target, mix: List[Dict], rate: float, duration: float = 10.0,
+                   arrival: str = "poisson", max_in_flight: int = 1000, seed: int = 0) -> Dict:
+    """Replay ``mix`` at ``rate`` queries/s for ``duration`` seconds (open loop)
+
+    Requests are sent on schedule whether or not earlier ones finished.
+    Response time is measured from each request's *intended* send time, so
+    queueing behind a stall is counted (coordinated-omission correction);
+    service time is measured from the actual send. Past ``max_in_flight``
+    outstanding requests, new ones wait (and that wait counts as latency).
+    """
+    rng = random.Random(seed)
+    weights = [entry["weight"] for entry in mix]
+    schedule = _arrival_times(rate, duration, arrival, rng)
+    queries = rng.choices(mix, weights=weights, k=len(schedule))
+
+    response_times = LatencyHistogram()
+    service_times = LatencyHistogram()
+    errors: Dict[str, int] = {}
+    in_flight = asyncio.Semaphore(max_in_flight)
+    max_send_lag = 0.0
+
+    async def issue(intended: float, entry: Dict):
+        async with in_flight:
+            sent = time.perf_counter()
+            try:
+                result = await target.send(entry["query"], entry["query_type"])
+                error = None if result.get("status") == "success" else result.get("error", "unsuccessful response")
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            finished = time.perf_counter()
+        response_times.record(finished - intended)
+        service_times.record(finished - sent)
+        if error is not None:
+            key = str(error)[:120]
+            errors[key] = errors.get(key, 0) + 1
+
+    loop = asyncio.get_running_loop()
+    tasks = []
+    start = time.perf_counter()
+    for offset, entry in zip(schedule, queries):
+        intended = start + offset
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        max_send_lag = max(max_send_lag, time.perf_counter() - intended)
+        tasks.append(loop.create_task(issue(intended, entry)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    sent = len(schedule)
+    failed = sum(errors.values())
+    return {
+        "target": target.name,
+        "arrival": arrival,
+        "target_rate": rate,
+        "duration": duration,
+        "sent": sent,
+        "completed": sent - failed,
+        "errors": failed,
+        "error_rate": failed / sent if sent else 0.0,
+        "throughput": (sent - failed) / elapsed if elapsed else 0.0,
+        "elapsed": elapsed,
+        # The generator itself fell behind schedule by this much (in-process targets share its loop)
+        "max_send_lag": max_send_lag,
+        "response_time": response_times.summary(),
+        "service_time": service_times.summary(),
+        "response_time_histogram": response_times.buckets(),
+        "error_messages": errors,
+    }
+
+async def run_load_steps(target, mix: List[Dict], rates: List[float], duration: float = 10.0,
+                         arrival: str = "poisson", max_in_flight: int = 1000, seed: int = 0) -> List[Dict]:
+    """One open-loop run per target rate, against a single set-up target"""
+    await target.setup()
+    try:
+        return [await run_load(target, mix, rate, duration, arrival, max_in_flight, seed + step)
+                for step, rate in enumerate(rates)]
+    finally:
+        await target.close()
+
+def save_load_report(results: List[Dict], report_dir: Path = REPORT_DIR) -> Path:
+    report_dir.mkdir(parents=True, exist_ok=True)
+    path = report_dir / f"load_test_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    path.write_text(json.dumps({"generated_at": datetime.now().isoformat(), "runs": results}, indent=2))
+    return path
+
+if __name__ == "__main__":
+    from main import TireManufacturingOrchestrator
+
+    results = asyncio.run(run_load_steps(
+        InProcessTarget(TireManufacturingOrchestrator()), synthetic_query_mix(), rates=[50, 200], duration=5
+    ))
+    for run in results:
+        latency = run["response_time"]
+        print(f"📈 {run['target_rate']:>6.0f} q/s target: {run['throughput']:7.1f} q/s achieved, "
+              f"p50 {latency['p50'] * 1000:.1f} ms, p99 {latency['p99'] * 1000:.1f} ms, "
+              f"errors {run['error_rate']:.1%}")
+    print(f"Report: {save_load_report(results)}")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+🗃️ Preprocessed Image Cache for CV Testing
+Content-addressed store of preprocessed tensors kept as memory-mapped .npy blobs
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = Path("data/cache/preprocessed")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+class PreprocessCache:
+    """LRU cache of preprocessed images keyed by raw bytes + preprocessing config"""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> blob size, least recently used first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._load_index()
+
+    @staticmethod
+    def make_key(raw_bytes: bytes, config: Dict) -> str:
+        """Content hash of the raw image bytes and the preprocessing config"""
+        digest = hashlib.blake2b(raw_bytes, digest_size=20)
+        digest.update(json.dumps(config, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _blob_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.npy"
+
+    def _load_index(self):
+        """Rebuild LRU order from blobs left by previous runs (oldest access first)"""
+        blobs = []
+        for blob in self.cache_dir.glob("*/*.npy"):
+            stat = blob.stat()
+            blobs.append((stat.st_mtime, blob.stem, stat.st_size))
+
+        for _, key, size in sorted(blobs):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._blob_path(key).unlink(missing_ok=True)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return a read-only memory-mapped array, or None on a miss"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        blob = self._blob_path(key)
+        try:
+            os.utime(blob)  # Persist recency for the next run's LRU order
+            return np.load(blob, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+            return None
+
+    def put(self, key: str, array: np.ndarray) -> np.ndarray:
+        """Store an array and return it memory-mapped from the cache"""
+        size = array.nbytes
+        if size > self.max_bytes:
+            return array
+
+        blob = self._blob_path(key)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = blob.with_name(f"{blob.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(array))
+        os.replace(tmp_path, blob)
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries[key]
+            self._entries[key] = blob.stat().st_size
+            self._total_bytes += self._entries[key]
+            self._evict()
+
+        return np.load(blob, mmap_mode="r") if blob.exists() else array
+
+    def get_or_compute(self, image_path: Path, config: Dict, compute: Callable[[bytes], np.ndarray]) -> np.ndarray:
+        """Return the cached tensor for an image, running compute(raw_bytes) on a miss"""
+        raw_bytes = Path(image_path).read_bytes()
+        key = self.make_key(raw_bytes, config)
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        return self.put(key, compute(raw_bytes))
+
+    def clear(self):
+        """Remove every cached blob"""
+        with self._lock:
+            for key in list(self._entries):
+                self._blob_path(key).unlink(missing_ok=True)
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict:
+        """Cache usage statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
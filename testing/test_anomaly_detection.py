@@ -0,0 +1,44 @@
+"""Regression tests for the rolling robust z-score detector"""
+
+import numpy as np
+import pytest
+
+from tools.anomaly_detection import RollingAnomalyDetector, robust_zscores
+
+WINDOW = 120
+SPIKES = (1010, 1050, 1100, 1500)
+
+def _series(length: int = 2000, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    values = 180.0 + rng.normal(0.0, 1.0, length)
+    values[list(SPIKES)] += 25.0
+    return values
+
+def _flagged(detector: RollingAnomalyDetector, values: np.ndarray, splits) -> list:
+    timestamps = np.arange(len(values), dtype=np.float64)
+    findings = []
+    for start, end in zip((0, *splits), (*splits, len(values))):
+        findings += detector.process("press-1", timestamps[start:end], values[start:end])
+    return sorted(int(finding["timestamp"]) for finding in findings)
+
+@pytest.mark.parametrize("splits", [(1000,), (1001, 1049), (250, 500, 1005, 1600), tuple(range(100, 2000, 100))])
+def test_batched_findings_match_a_single_pass(splits):
+    values = _series()
+    single = _flagged(RollingAnomalyDetector(window=WINDOW), values, ())
+    batched = _flagged(RollingAnomalyDetector(window=WINDOW), values, splits)
+
+    assert set(SPIKES) <= set(single)
+    assert batched == single
+
+def test_batched_scores_match_a_single_pass():
+    values = _series()
+    expected = robust_zscores(values, WINDOW)
+
+    detector = RollingAnomalyDetector(window=WINDOW, threshold=0.0)
+    timestamps = np.arange(len(values), dtype=np.float64)
+    scores = np.zeros(len(values))
+    for start in range(0, len(values), 333):
+        for finding in detector.process("press-1", timestamps[start:start + 333], values[start:start + 333]):
+            scores[int(finding["timestamp"])] = finding["score"]
+
+    np.testing.assert_allclose(scores, expected)
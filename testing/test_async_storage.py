@@ -0,0 +1,74 @@
+"""AsyncStorage: coalesced, atomic writes whose failures are never silent"""
+
+import json
+import logging
+import os
+import threading
+
+import pytest
+
+from tools import async_storage
+from tools.async_storage import AsyncStorage
+
+@pytest.fixture
+def storage():
+    storage = AsyncStorage(fsync="never")
+    yield storage
+    storage.close()
+
+def _hold_writer(storage: AsyncStorage) -> threading.Event:
+    """Park the writer thread so later submissions stay queued"""
+    gate = threading.Event()
+    storage._executor.submit(gate.wait)
+    return gate
+
+def test_queued_writes_to_one_path_are_coalesced(storage, tmp_path):
+    path = tmp_path / "report.json"
+    gate = _hold_writer(storage)
+    futures = [storage.submit_json(path, {"version": i}) for i in range(5)]
+    gate.set()
+
+    assert {future.result(timeout=5) for future in futures} == {path}
+    assert json.loads(path.read_text()) == {"version": 4}
+    assert storage.writes == 1 and storage.coalesced == 4
+
+def test_payload_is_serialized_at_submit(storage, tmp_path):
+    path = tmp_path / "report.json"
+    payload = {"status": "queued"}
+    gate = _hold_writer(storage)
+    future = storage.submit_json(path, payload)
+    payload["status"] = "mutated"
+    gate.set()
+
+    future.result(timeout=5)
+    assert json.loads(path.read_text()) == {"status": "queued"}
+
+def test_failed_write_keeps_the_old_file_and_is_logged(storage, tmp_path, monkeypatch, caplog):
+    path = tmp_path / "report.json"
+    storage.submit_json(path, {"version": 1}).result(timeout=5)
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(async_storage.os, "replace", failing_replace)
+    with caplog.at_level(logging.ERROR, logger="tools.async_storage"):
+        future = storage.submit_json(path, {"version": 2})
+        with pytest.raises(OSError, match="disk full"):
+            future.result(timeout=5)
+
+    assert json.loads(path.read_text()) == {"version": 1}
+    assert os.listdir(tmp_path) == ["report.json"]  # Temp file cleaned up
+    assert storage.errors == 1
+    assert "disk full" in caplog.text
+
+def test_close_writes_queued_data(tmp_path):
+    storage = AsyncStorage(fsync="interval", fsync_interval=60)
+    gate = _hold_writer(storage)
+    storage.submit_bytes(tmp_path / "profile.collapsed", b"main;run 3\n")
+    threading.Timer(0.05, gate.set).start()
+    storage.close()
+
+    assert (tmp_path / "profile.collapsed").read_bytes() == b"main;run 3\n"
+    assert storage.fsyncs == 1  # Interval policy synced on close
+    with pytest.raises(RuntimeError):
+        storage.submit_bytes(tmp_path / "late.bin", b"")
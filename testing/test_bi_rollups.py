@@ -0,0 +1,70 @@
+"""KPI rollups: re-reading the store (as the dashboard does) must neither freeze nor double count"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("streamlit")
+
+from dashboards.business_intelligence import TireManufacturingBI
+from dashboards.inspection_store import InspectionStore
+from dashboards.rollups import RollupStore
+
+def _results(start: datetime, count: int):
+    return [{"timestamp": start + timedelta(seconds=i), "line": "Line 1", "defect_class": "none",
+             "latency": 0.01, "actual_defective": False} for i in range(count)]
+
+def _inspections(bi: TireManufacturingBI, start: datetime) -> int:
+    series = bi.generate_kpi_timeseries(start - timedelta(hours=1), start + timedelta(hours=1), resolution="hour")
+    assert "error" not in series
+    return sum(point["inspections"] for point in series["points"])
+
+def test_reader_rollups_pick_up_results_written_elsewhere(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    writer = InspectionStore(tmp_path / "inspections")
+    reader = TireManufacturingBI(store=InspectionStore(tmp_path / "inspections"), rollup_refresh_seconds=0)
+    start = datetime.now().replace(minute=0, second=0, microsecond=0)
+
+    writer.append_many(_results(start, 10))
+    writer.flush()
+    assert _inspections(reader, start) == 10
+
+    writer.append_many(_results(start + timedelta(minutes=5), 7))
+    writer.flush()
+    assert _inspections(reader, start) == 17  # Re-read, not frozen and not double counted
+    assert _inspections(reader, start) == 17
+
+def test_refresh_is_rate_limited(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    writer = InspectionStore(tmp_path / "inspections")
+    reader = TireManufacturingBI(store=InspectionStore(tmp_path / "inspections"), rollup_refresh_seconds=3600)
+    start = datetime.now().replace(minute=0, second=0, microsecond=0)
+
+    writer.append_many(_results(start, 4))
+    writer.flush()
+    assert _inspections(reader, start) == 4
+
+    writer.append_many(_results(start, 4))
+    writer.flush()
+    assert _inspections(reader, start) == 4
+
+def test_refreshing_a_day_keeps_night_shift_totals(tmp_path):
+    store = InspectionStore(tmp_path / "inspections")
+    store.append_many(_results(datetime(2026, 10, 18, 23, 0), 3))  # Night shift, evening half
+    store.append_many(_results(datetime(2026, 10, 19, 1, 0), 2))  # Same shift, after midnight
+    store.append_many(_results(datetime(2026, 10, 19, 7, 0), 4))
+    store.flush()
+    rollups = RollupStore()
+    rollups.backfill(store, date(2026, 10, 18), date(2026, 10, 19))
+
+    def totals(resolution):
+        _, points = rollups.series(datetime(2026, 10, 18), datetime(2026, 10, 20), resolution)
+        return {point["period"]: point["inspections"] for point in points}
+
+    expected = {resolution: totals(resolution) for resolution in ("hour", "shift", "day")}
+    assert expected["shift"] == {datetime(2026, 10, 18, 22): 5, datetime(2026, 10, 19, 6): 4}
+    for _ in range(2):
+        rollups.backfill(store, date(2026, 10, 19), date(2026, 10, 19))
+        assert {resolution: totals(resolution) for resolution in expected} == expected
+    store.close()
@@ -0,0 +1,40 @@
+"""CV test report: each precision mode is benchmarked once, and only real timings are compared"""
+
+from collections import Counter
+
+from testing.cv_testing import TireDefectTester
+
+def test_report_benchmarks_each_mode_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tester = TireDefectTester(use_preprocess_cache=False)
+    runs = Counter()
+    original = tester.test_inference_speed
+
+    def counting_speed_test(iterations=10, precision=None):
+        runs[precision or tester.precision] += 1
+        return original(iterations, precision)
+
+    monkeypatch.setattr(tester, "test_inference_speed", counting_speed_test)
+    report = tester.generate_test_report()
+
+    assert runs["fp32"] == 1
+    assert set(runs.values()) == {1}
+    assert report["precision_modes"]["modes"]["fp32"]["performance_metrics"] is report["performance_metrics"]
+    assert (tmp_path / "data/reports/cv_test_report.json").exists()
+
+def test_simulated_mode_is_unsupported_and_not_recommended(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tester = TireDefectTester(precision="bf16", use_preprocess_cache=False)
+    original = tester.build_detector
+
+    def without_bf16(precision=None):
+        # A CPU without native bf16 kernels
+        return None if (precision or tester.precision) == "bf16" else original(precision)
+
+    monkeypatch.setattr(tester, "build_detector", without_bf16)
+    report = tester.generate_test_report()
+    comparison = report["precision_modes"]
+
+    assert report["performance_metrics"]["simulated"]
+    assert comparison["modes"]["bf16"] == {"supported": False}
+    assert comparison["recommended_mode"] != "bf16"
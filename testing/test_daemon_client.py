@@ -0,0 +1,70 @@
+"""The daemon client must fall back (return None) whenever no daemon answers"""
+
+import asyncio
+import socket
+import time
+
+import pytest
+
+from api.daemon import OrchestratorDaemon, query_daemon, send_request, socket_accepting
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return tmp_path / "orchestrator.sock"
+
+def test_missing_socket_falls_back(socket_path):
+    assert send_request({"op": "ping"}, socket_path) is None
+
+def test_stale_socket_falls_back(socket_path):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(socket_path))
+    stale.close()  # Path left behind, nobody listening
+
+    assert socket_path.exists()
+    assert query_daemon("Why are cracks increasing?", socket_path=socket_path) is None
+    assert not socket_accepting(socket_path)
+
+def test_hung_daemon_times_out_and_falls_back(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as hung:
+        hung.bind(str(socket_path))
+        hung.listen()  # Accepts connections in the backlog but never replies
+
+        assert send_request({"op": "ping"}, socket_path, timeout=0.2) is None
+        assert socket_accepting(socket_path)
+
+def test_unreadable_socket_falls_back(socket_path):
+    socket_path.write_text("not a socket")
+    assert send_request({"op": "ping"}, socket_path) is None
+
+class _ReadyOrchestrator:
+    system_status = "ready"
+
+    async def process_query(self, query, query_type="auto"):
+        return {"status": "success", "query": query}
+
+@pytest.mark.parametrize("line", [b'{"op": "query"}', b'{"op": "query", "query": ""}', b'{"query": 42}',
+                                  b'[1]', b'"x"', b'null', b'not json'])
+def test_malformed_request_is_an_error_reply(socket_path, line):
+    daemon = OrchestratorDaemon(_ReadyOrchestrator(), socket_path)
+
+    response = asyncio.run(daemon._dispatch(line))
+
+    assert response["status"] == "error"
+    assert daemon.queries_served == 0
+
+def test_query_is_dispatched(socket_path):
+    daemon = OrchestratorDaemon(_ReadyOrchestrator(), socket_path)
+
+    response = asyncio.run(daemon._dispatch(b'{"op": "query", "query": "cracks"}'))
+
+    assert response == {"status": "success", "query": "cracks"}
+
+def test_query_against_hung_daemon_gives_up_after_the_ping(socket_path, monkeypatch):
+    monkeypatch.setattr("api.daemon.PING_TIMEOUT_SECONDS", 0.2)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as hung:
+        hung.bind(str(socket_path))
+        hung.listen()
+
+        started = time.monotonic()
+        assert query_daemon("cracks", socket_path=socket_path, timeout=30) is None
+        assert time.monotonic() - started < 5
@@ -0,0 +1,38 @@
+"""POST /inspections must ingest off the event loop"""
+
+import threading
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("duckdb")
+
+from fastapi.testclient import TestClient
+
+from api.server import create_app
+from dashboards.business_intelligence import TireManufacturingBI
+from dashboards.inspection_store import InspectionStore
+
+def test_inspections_are_ingested_on_the_ingest_thread(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    bi = TireManufacturingBI(store=InspectionStore(tmp_path / "inspections"))
+    threads = []
+    original = bi.ingest_result
+
+    def recording_ingest(result):
+        threads.append(threading.current_thread().name)
+        original(result)
+
+    monkeypatch.setattr(bi, "ingest_result", recording_ingest)
+    with TestClient(create_app(bi=bi)) as client:
+        results = [{"timestamp": datetime(2026, 3, 2, 10, 0, i).isoformat(), "line": "Line 1",
+                    "defect_class": "none", "latency": 0.01} for i in range(3)]
+        response = client.post("/inspections", json=results)
+
+        assert response.json() == {"accepted": 3}
+        assert len(threads) == 3
+        assert all(name.startswith("inspection-ingest") for name in threads)
+
+    # Lifespan shutdown closed the store, writing the buffered results
+    assert InspectionStore(tmp_path / "inspections", flush_interval=None).partitions()
@@ -0,0 +1,60 @@
+"""InspectionStore durability: round trip, close() and the time-based flush"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+from dashboards.inspection_store import InspectionStore
+
+def _results(count: int, start: datetime):
+    return [{"timestamp": start + timedelta(seconds=i), "line": f"Line {i % 2 + 1}",
+             "defect_class": "crack" if i % 4 == 0 else "none", "confidence": 0.9, "latency": 0.02,
+             "actual_defective": i % 4 == 0} for i in range(count)]
+
+def test_round_trip(tmp_path):
+    store = InspectionStore(tmp_path, flush_interval=None)
+    start = datetime(2026, 3, 2, 10, 0)
+    store.append_many(_results(40, start))
+
+    [totals] = store.query_kpis(start.date(), start.date(), granularity=None)
+    assert totals["inspections"] == 40
+    assert totals["defects"] == 10
+    assert totals["sensitivity"] == 1.0 and totals["specificity"] == 1.0
+    assert sum(batch.num_rows for batch in store.iter_batches(start.date(), chunk_rows=16)) == 40
+    assert store.partitions() == [start.date()]
+    store.close()
+
+def test_results_split_across_day_partitions(tmp_path):
+    store = InspectionStore(tmp_path, flush_interval=None)
+    store.append_many(_results(10, datetime(2026, 3, 2, 23, 59, 55)))
+    store.flush()
+
+    assert [day.day for day in store.partitions()] == [2, 3]
+    store.close()
+
+def test_close_writes_the_buffer(tmp_path):
+    store = InspectionStore(tmp_path, flush_rows=100_000, flush_interval=None)
+    store.append_many(_results(5, datetime(2026, 3, 2, 10, 0)))
+    assert InspectionStore(tmp_path, flush_interval=None).partitions() == []
+
+    store.close()
+    store.close()  # Idempotent
+
+    assert len(InspectionStore(tmp_path, flush_interval=None).partitions()) == 1
+    with pytest.raises(RuntimeError):
+        store.append({"timestamp": datetime(2026, 3, 2, 10, 0)})
+
+def test_low_volume_results_are_flushed_on_a_timer(tmp_path):
+    store = InspectionStore(tmp_path, flush_rows=100_000, flush_interval=0.1)
+    store.append_many(_results(1, datetime(2026, 3, 2, 10, 0)))
+
+    reader = InspectionStore(tmp_path, flush_interval=None)
+    deadline = time.monotonic() + 5
+    while not reader.partitions() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert len(reader.partitions()) == 1
+    store.close()
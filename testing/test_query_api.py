@@ -0,0 +1,54 @@
+"""POST /query: opt-in, and validated before it reaches the orchestrator"""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("duckdb")
+
+from fastapi.testclient import TestClient
+
+from api.server import create_app
+from dashboards.business_intelligence import TireManufacturingBI
+from dashboards.inspection_store import InspectionStore
+
+class RecordingOrchestrator:
+    system_status = "ready"
+
+    def __init__(self):
+        self.queries = []
+
+    async def process_query(self, query: str, query_type: str):
+        self.queries.append((query, query_type))
+        return {"status": "success", "response": "ok"}
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def bi(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return TireManufacturingBI(store=InspectionStore(tmp_path / "inspections"))
+
+def test_query_is_disabled_without_an_orchestrator(bi):
+    with TestClient(create_app(bi=bi)) as client:
+        response = client.post("/query", json={"query": "defect rate on line 2?"})
+
+    assert response.json()["status"] == "error"
+    assert "--with-query" in response.json()["error"]
+
+@pytest.mark.parametrize("body", [{}, {"query_type": "auto"}, {"query": ""}, {"query": 42}])
+def test_malformed_query_is_rejected(bi, body):
+    orchestrator = RecordingOrchestrator()
+    with TestClient(create_app(bi=bi, orchestrator=orchestrator)) as client:
+        response = client.post("/query", json=body)
+
+    assert response.status_code == 422
+    assert orchestrator.queries == []
+
+def test_query_reaches_the_orchestrator(bi):
+    orchestrator = RecordingOrchestrator()
+    with TestClient(create_app(bi=bi, orchestrator=orchestrator)) as client:
+        response = client.post("/query", json={"query": "defect rate on line 2?"})
+
+    assert response.json()["status"] == "success"
+    assert orchestrator.queries == [("defect rate on line 2?", "auto")]
@@ -0,0 +1,61 @@
+"""Sliding-window rate limiting: limits, window roll-over, sweeping and per-client keys"""
+
+import pytest
+
+from security import basic_security
+from security.audit_log import AuditLogWriter
+from security.basic_security import BasicSecurityManager, rate_limited
+from security.rate_limiter import InMemoryRateLimitBackend, SlidingWindowRateLimiter
+
+WINDOW = 60.0
+
+def _allowed(backend, key: str, count: int, now: float, limit: int = 10) -> int:
+    return sum(backend.hit(key, limit, WINDOW, now)[0] for _ in range(count))
+
+def test_limit_holds_within_one_window():
+    backend = InMemoryRateLimitBackend()
+    assert _allowed(backend, "10.0.0.1", 15, now=600.0) == 10
+    assert _allowed(backend, "10.0.0.2", 15, now=600.0) == 10  # Keys are independent
+
+def test_previous_window_is_weighted_by_its_remaining_overlap():
+    backend = InMemoryRateLimitBackend()
+    assert _allowed(backend, "client", 10, now=600.0) == 10
+
+    # Halfway into the next window the previous 10 still count as 5
+    assert _allowed(backend, "client", 10, now=600.0 + 1.5 * WINDOW) == 5
+
+def test_counts_expire_after_two_windows():
+    backend = InMemoryRateLimitBackend()
+    _allowed(backend, "client", 10, now=600.0)
+    assert _allowed(backend, "client", 10, now=600.0 + 2 * WINDOW) == 10
+
+def test_idle_keys_are_swept():
+    backend = InMemoryRateLimitBackend()
+    _allowed(backend, "idle", 1, now=600.0)
+    _allowed(backend, "active", 1, now=600.0 + 2 * WINDOW)
+
+    assert backend.sweep(600.0 + 2 * WINDOW) == 1
+    assert len(backend) == 1
+
+def test_limits_with_different_windows_count_separately():
+    limiter = SlidingWindowRateLimiter(limit=3, window=WINDOW)
+    assert sum(limiter.allow("client") for _ in range(5)) == 3
+    assert limiter.allow("client", limit=3, window=1.0)
+
+def test_decorator_keys_positional_clients_separately(tmp_path, monkeypatch):
+    manager = BasicSecurityManager(audit_writer=AuditLogWriter(tmp_path / "audit.log"))
+    monkeypatch.setattr(basic_security, "security_manager", manager)
+
+    @rate_limited(max_attempts=2)
+    def lookup(client_id: str, query: str) -> str:
+        return query
+
+    for _ in range(2):
+        lookup("station-1", "status")
+    with pytest.raises(Exception, match="Rate limit exceeded"):
+        lookup("station-1", "status")
+    with pytest.raises(Exception, match="Rate limit exceeded"):
+        lookup(client_id="station-1", query="status")  # Same bucket however it is passed
+
+    assert lookup("station-2", "status") == "status"
+    manager.audit_writer.close()
@@ -0,0 +1,30 @@
+"""Signature matching: both backends agree, and a slow fallback is not silent"""
+
+import logging
+
+import pytest
+
+from security import signatures
+from security.signatures import REGEX_SIGNATURE_LIMIT, SignatureSet
+
+BACKENDS = ["regex"] + (["automaton"] if signatures.ahocorasick is not None else [])
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_find_the_built_in_signatures(backend):
+    signature_set = SignatureSet(backend=backend)
+
+    assert signature_set.match("x'; DROP TABLE users") == ("';", "sql_injection")
+    assert signature_set.match("<SCRIPT>alert(1)</script>") == ("<script", "xss")
+    assert signature_set.match("What causes tire sidewall defects?") is None
+
+def test_large_set_on_the_regex_fallback_warns(monkeypatch, caplog):
+    monkeypatch.setattr(signatures, "ahocorasick", None)
+    large = {"custom": [f"sig-{i:05d}" for i in range(REGEX_SIGNATURE_LIMIT + 1)]}
+
+    with caplog.at_level(logging.WARNING, logger="security"):
+        SignatureSet()
+        assert not caplog.records
+        SignatureSet(large, backend="regex")  # Chosen explicitly, e.g. by the benchmark
+        assert not caplog.records
+        assert SignatureSet(large).backend == "regex"
+    assert "pyahocorasick" in caplog.text
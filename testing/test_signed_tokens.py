@@ -0,0 +1,62 @@
+"""Signed session tokens: revocation filter and shared-key handling"""
+
+import logging
+import secrets
+
+import pytest
+
+from security.signed_tokens import SIGNING_KEY_ENV, RevocationBloomFilter, SignedTokenManager
+
+def _ids(count: int):
+    return [secrets.token_bytes(8) for _ in range(count)]
+
+def test_revoked_ids_are_always_found():
+    revocations = RevocationBloomFilter(capacity=1_000, error_rate=0.01)
+    revoked = _ids(1_000)
+    for token_id in revoked:
+        revocations.add(token_id)
+
+    assert all(token_id in revocations for token_id in revoked)
+    false_positives = sum(token_id in revocations for token_id in _ids(10_000))
+    assert false_positives < 300  # ~1% expected at capacity
+
+def test_revocations_expire_after_two_generations():
+    revocations = RevocationBloomFilter(ttl_seconds=60)
+    token_id = b"revoked!"
+    revocations.add(token_id)
+
+    revocations._rotated_at -= 60  # One rotation: still in the previous generation
+    assert token_id in revocations
+    revocations._rotated_at -= 60  # Two: forgotten, the token has expired by now
+    assert token_id not in revocations
+
+def test_merge_shares_revocations_between_workers():
+    first, second = RevocationBloomFilter(), RevocationBloomFilter()
+    first.add(b"token-01")
+    second.add(b"token-02")
+    second.merge(first.to_bytes())
+
+    assert b"token-01" in second and b"token-02" in second
+
+def test_revoked_token_is_rejected():
+    manager = SignedTokenManager(secrets.token_bytes(32))
+    token = manager.issue("operator")
+    assert manager.validate(token) == "operator"
+
+    manager.revoke(token)
+    assert manager.validate(token) is None
+
+def test_workers_sharing_the_env_key_accept_each_others_tokens(monkeypatch):
+    monkeypatch.setenv(SIGNING_KEY_ENV, secrets.token_hex(32))
+    issuer, validator = SignedTokenManager.from_env(), SignedTokenManager.from_env()
+
+    assert validator.validate(issuer.issue("operator")) == "operator"
+
+def test_missing_key_is_required_for_workers_and_warned_about_otherwise(monkeypatch, caplog):
+    monkeypatch.delenv(SIGNING_KEY_ENV, raising=False)
+    with pytest.raises(RuntimeError, match=SIGNING_KEY_ENV):
+        SignedTokenManager.from_env()
+
+    with caplog.at_level(logging.WARNING, logger="security"):
+        SignedTokenManager()
+    assert SIGNING_KEY_ENV in caplog.text
@@ -0,0 +1,63 @@
+"""Verification runner: discovery, cache keys and skip classification"""
+
+from testing import verification
+from testing.verification import (PROJECT_ROOT, SourceHasher, _missing_third_party_module, _local_imports,
+                                  discover_checks)
+
+def _write(root, relative, text):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+def test_cli_check_is_keyed_on_main_and_its_command_imports():
+    [check] = [check for check in discover_checks() if check.function == "check_cli_commands"]
+    assert check.path == "main.py"
+
+    dependencies = {path.relative_to(PROJECT_ROOT).as_posix() for path in _local_imports(PROJECT_ROOT / "main.py", PROJECT_ROOT)}
+    assert {"api/daemon.py", "testing/verification.py", "tools/worker_pool.py"} <= dependencies
+
+def test_pytest_modules_are_not_discovered():
+    assert not [check for check in discover_checks() if check.path.startswith("testing/test_")]
+
+def test_hash_changes_with_a_transitive_dependency(tmp_path):
+    _write(tmp_path, "pkg/__init__.py", "")
+    _write(tmp_path, "pkg/check.py", "from pkg.helpers import value\n\ndef check_value():\n    return value()\n")
+    _write(tmp_path, "pkg/helpers.py", "def value():\n    import pkg.deep\n    return 1\n")
+    deep = _write(tmp_path, "pkg/deep.py", "X = 1\n")
+
+    [check] = discover_checks(tmp_path, packages=("pkg",), modules=())
+    before = SourceHasher(tmp_path).module_hash(tmp_path / check.path)
+    deep.write_text("X = 2\n")
+
+    assert SourceHasher(tmp_path).module_hash(tmp_path / check.path) != before
+
+def test_only_missing_third_party_modules_are_skips():
+    missing_dependency = ModuleNotFoundError("No module named 'cv2'", name="cv2")
+    missing_project_module = ModuleNotFoundError("No module named 'tools.renamed'", name="tools.renamed")
+    missing_symbol = ImportError("cannot import name 'renamed_symbol' from 'tools.telemetry'")
+
+    assert _missing_third_party_module(missing_dependency)
+    assert not _missing_third_party_module(missing_project_module)
+    assert not _missing_third_party_module(missing_symbol)
+
+def test_skips_are_rerun_but_passes_are_cached(tmp_path, monkeypatch):
+    _write(tmp_path, "tools/__init__.py", "")
+    _write(tmp_path, "tools/probe.py", "def check_probe():\n    import not_installed_yet\n")
+    outcomes = {"status": "skipped", "error": "ModuleNotFoundError: No module named 'not_installed_yet'"}
+    runs = []
+
+    def fake_run_check(check, timeout, root):
+        runs.append(check.check_id)
+        return dict(outcomes)
+
+    monkeypatch.setattr(verification, "run_check", fake_run_check)
+
+    def verify():
+        return verification.run_verification(root=tmp_path, report_path=None, jobs=1)
+
+    verify()
+    outcomes["status"] = "passed"  # The dependency was installed in between
+    assert verify()["summary"]["passed"] == 1
+    assert verify()["cached"] == 1
+    assert runs == ["tools.probe:check_probe"] * 2
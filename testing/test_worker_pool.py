@@ -0,0 +1,45 @@
+"""Worker pool: a worker that dies or hangs fails its task instead of hanging the caller"""
+
+import os
+import time
+
+import pytest
+
+from tools.worker_pool import QueryWorkerPool
+
+PROBE = {"probe": {"module": "testing.test_worker_pool", "class": "Probe"}}
+
+class Probe:
+    """Constructed in the workers (spawned processes import it from this module)"""
+
+    def echo(self, value):
+        return value
+
+    def crash(self):
+        os._exit(3)  # Dies straight after dequeuing, before any message reaches the pool
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+@pytest.fixture
+def pool():
+    pool = QueryWorkerPool(1, components=PROBE, index_path=None, heartbeat_interval=0.1,
+                           heartbeat_timeout=5.0, task_timeout=1.0).start()
+    yield pool
+    pool.close()
+
+def test_task_of_a_dead_worker_fails(pool):
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        pool.submit("probe", "crash").result(timeout=30)
+
+    assert pool.submit("probe", "echo", 1).result(timeout=30) == 1
+    assert pool.restarts == 1
+
+def test_overrunning_worker_is_halted_not_killed(pool):
+    worker = pool._processes[0]
+    with pytest.raises(RuntimeError, match="longer than"):
+        pool.submit("probe", "sleep", 30).result(timeout=30)
+
+    assert worker.exitcode == 1  # Left through its halt path, not SIGTERM
+    assert pool.submit("probe", "echo", 2).result(timeout=30) == 2
+    assert pool.stats()["queued"] == 0
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+✅ Verification Runner for the Tire Manufacturing RAG System
+Discovers check_/test_/benchmark_ functions across the packages, runs each in
+its own subprocess in parallel, and merges the results into one report.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Add project root to path
+sys.path.append(str(PROJECT_ROOT))
+
+from tools.async_storage import write_json_atomic
+
+CHECK_PACKAGES = ("agents", "tools", "testing", "dashboards", "security")
+CHECK_MODULES = ("main.py",)  # Top-level modules, e.g. CLI checks that import the commands they run
+CHECK_PREFIXES = {"check_": "check", "test_": "test", "benchmark_": "benchmark"}
+DEFAULT_KINDS = ("check", "test")
+DEFAULT_TIMEOUT_SECONDS = 120.0
+DEFAULT_REPORT_PATH = Path("data/reports/verification_report.json")
+DEFAULT_CACHE_PATH = Path("data/reports/.verification_cache.json")
+# Skips depend on installed packages, which the source hash does not cover
+CACHED_STATUSES = ("passed", "failed")
+
+RESULT_MARKER = "__VERIFICATION_RESULT__ "
+MAX_RESULT_CHARS = 20_000
+OUTPUT_TAIL_LINES = 30
+
+@dataclass
+class Check:
+    """One discovered check function"""
+    module: str
+    function: str
+    kind: str
+    is_async: bool
+    path: str
+
+    @property
+    def check_id(self) -> str:
+        return f"{self.module}:{self.function}"
+
+def _module_name(path: Path, root: Path) -> str:
+    parts = list(path.relative_to(root).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+def _callable_without_arguments(node) -> bool:
+    args = node.args
+    positional = args.posonlyargs + args.args
+    if len(positional) > len(args.defaults):
+        return False
+    return all(default is not None for default in args.kw_defaults)
+
+def _check_sources(root: Path, packages: Sequence[str], modules: Sequence[str]) -> List[Path]:
+    sources = []
+    for package in packages:
+        # pytest modules (test_*.py) belong to pytest: their tests rely on fixtures and marks
+        sources.extend(path for path in sorted((root / package).rglob("*.py")) if not path.name.startswith("test_"))
+    sources.extend(root / module for module in modules if (root / module).is_file())
+    return sources
+
+def discover_checks(root: Path = PROJECT_ROOT, packages: Sequence[str] = CHECK_PACKAGES,
+                    kinds: Iterable[str] = DEFAULT_KINDS, modules: Sequence[str] = CHECK_MODULES) -> List[Check]:
+    """Top-level check functions callable without arguments, found by parsing (not importing) each module"""
+    kinds = set(kinds)
+    checks = []
+    for path in _check_sources(root, packages, modules):
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        except SyntaxError:
+            continue
+        for node in tree.body:
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            kind = next((kind for prefix, kind in CHECK_PREFIXES.items() if node.name.startswith(prefix)), None)
+            if kind in kinds and _callable_without_arguments(node):
+                checks.append(Check(
+                    module=_module_name(path, root),
+                    function=node.name,
+                    kind=kind,
+                    is_async=isinstance(node, ast.AsyncFunctionDef),
+                    path=str(path.relative_to(root)),
+                ))
+    return checks
+
+def _local_imports(path: Path, root: Path) -> List[Path]:
+    """Project files imported by ``path`` (absolute imports only, as this repo uses)"""
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError):
+        return []
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+            names.extend(f"{node.module}.{alias.name}" for alias in node.names)
+
+    found = []
+    for name in names:
+        base = root.joinpath(*name.split("."))
+        for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+            if candidate.is_file():
+                found.append(candidate)
+                break
+    return found
+
+class SourceHasher:
+    """Hash of a module's source plus every project module it imports, transitively"""
+
+    def __init__(self, root: Path = PROJECT_ROOT):
+        self.root = root
+        self._hashes: Dict[Path, str] = {}
+
+    def _file_hash(self, path: Path) -> str:
+        digest = self._hashes.get(path)
+        if digest is None:
+            digest = self._hashes[path] = hashlib.sha256(path.read_bytes()).hexdigest()
+        return digest
+
+    def module_hash(self, path: Path) -> str:
+        seen = set()
+        pending = [self.root / path]
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            pending.extend(_local_imports(current, self.root))
+
+        digest = hashlib.sha256(sys.version.encode())
+        for dependency in sorted(seen):
+            digest.update(str(dependency.relative_to(self.root)).encode())
+            digest.update(self._file_hash(dependency).encode())
+        return digest.hexdigest()
+
+def _load_cache(path: Path) -> Dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _output_tail(text: str) -> List[str]:
+    return text.splitlines()[-OUTPUT_TAIL_LINES:]
+
+def run_check(check: Check, timeout: float = DEFAULT_TIMEOUT_SECONDS, root: Path = PROJECT_ROOT) -> Dict:
+    """Run one check in a fresh interpreter (own process group, killed on timeout)"""
+    command = [sys.executable, "-m", "testing.verification", "--run-one", check.check_id]
+    env = {**os.environ, "PYTHONPATH": str(root), "PYTHONUNBUFFERED": "1"}
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=root, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, start_new_session=True)
+    try:
+        output, _ = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        # The whole group, so pool workers and servers a check started go too
+        os.killpg(process.pid, signal.SIGKILL)
+        output, _ = process.communicate()
+        return {"status": "timeout", "error": f"No result after {timeout:g}s",
+                "seconds": time.perf_counter() - start, "output": _output_tail(output)}
+
+    seconds = time.perf_counter() - start
+    lines = output.splitlines()
+    marker_lines = [line for line in lines if line.startswith(RESULT_MARKER)]
+    if not marker_lines:
+        return {"status": "error", "error": f"Check process exited with code {process.returncode} without a result",
+                "seconds": seconds, "output": _output_tail(output)}
+
+    outcome = json.loads(marker_lines[-1][len(RESULT_MARKER):])
+    outcome["seconds"] = seconds
+    if outcome["status"] != "passed":
+        outcome["output"] = _output_tail("\n".join(line for line in lines if not line.startswith(RESULT_MARKER)))
+    return outcome
+
+def _missing_third_party_module(error: ImportError, root: Path = PROJECT_ROOT) -> bool:
+    """Whether an import failed only because a package outside the project is not installed
+
+    A missing or renamed project module, or a name that cannot be imported
+    from a module that exists, is a regression and must not read as a skip.
+    """
+    if not isinstance(error, ModuleNotFoundError) or not error.name:
+        return False
+    top_level = error.name.split(".")[0]
+    return not ((root / top_level).is_dir() or (root / f"{top_level}.py").is_file())
+
+def _run_one(check_id: str):
+    """Child side of ``run_check``: import, call, and print one result line"""
+    import asyncio
+    import importlib
+    import inspect
+    import traceback
+
+    module_name, function_name = check_id.split(":")
+    try:
+        function = getattr(importlib.import_module(module_name), function_name)
+        value = function()
+        if inspect.isawaitable(value):
+            value = asyncio.run(value)
+        outcome = {"status": "failed", "error": "Check returned False"} if value is False else {"status": "passed"}
+        encoded = json.dumps(value, default=str)
+        outcome["result"] = json.loads(encoded) if len(encoded) <= MAX_RESULT_CHARS else encoded[:MAX_RESULT_CHARS]
+    except ImportError as e:
+        if not _missing_third_party_module(e):
+            traceback.print_exc()
+            outcome = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+        else:
+            # Optional dependency not installed here: not a failure of the check itself
+            outcome = {"status": "skipped", "error": f"{type(e).__name__}: {e}"}
+    except BaseException as e:
+        traceback.print_exc()
+        outcome = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+    print(RESULT_MARKER + json.dumps(outcome, default=str), flush=True)
+
+def run_verification(kinds: Iterable[str] = DEFAULT_KINDS, match: Optional[str] = None,
+                     jobs: Optional[int] = None, timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                     use_cache: bool = True, cache_path: Path = DEFAULT_CACHE_PATH,
+                     report_path: Optional[Path] = DEFAULT_REPORT_PATH, root: Path = PROJECT_ROOT,
+                     on_result=None) -> Dict:
+    """Discover, run (in parallel, reusing cached results for unchanged modules) and report
+
+    A cached result is reused only while the check's module and every project
+    module it imports are byte-for-byte unchanged. Skips (a missing
+    dependency may be installed since), timeouts and runner errors are never
+    cached.
+    """
+    checks = [check for check in discover_checks(root, kinds=kinds) if not match or match in check.check_id]
+    hasher = SourceHasher(root)
+    cache = _load_cache(root / cache_path) if use_cache else {}
+    started = time.perf_counter()
+
+    results: Dict[str, Dict] = {}
+    pending = []
+    for check in checks:
+        source_hash = hasher.module_hash(Path(check.path))
+        cached = cache.get(check.check_id)
+        if cached and cached.get("source_hash") == source_hash and cached["outcome"]["status"] in CACHED_STATUSES:
+            results[check.check_id] = {**asdict(check), **cached["outcome"], "cached": True, "source_hash": source_hash}
+            if on_result:
+                on_result(results[check.check_id])
+        else:
+            pending.append((check, source_hash))
+
+    def execute(item):
+        check, source_hash = item
+        outcome = run_check(check, timeout, root)
+        result = {**asdict(check), **outcome, "cached": False, "source_hash": source_hash}
+        if on_result:
+            on_result(result)
+        return check, source_hash, outcome, result
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+        for check, source_hash, outcome, result in executor.map(execute, pending):
+            results[check.check_id] = result
+            if outcome["status"] in CACHED_STATUSES:
+                cache[check.check_id] = {"source_hash": source_hash, "outcome": outcome,
+                                         "ran_at": datetime.now().isoformat()}
+
+    if use_cache:
+        write_json_atomic(root / cache_path, cache, fsync=False)
+
+    ordered = [results[check.check_id] for check in checks]
+    summary = {status: sum(1 for result in ordered if result["status"] == status)
+               for status in ("passed", "failed", "timeout", "error", "skipped")}
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "kinds": sorted(set(kinds)),
+        "total": len(ordered),
+        "cached": sum(1 for result in ordered if result["cached"]),
+        "seconds": time.perf_counter() - started,
+        "summary": summary,
+        "success": not (summary["failed"] or summary["timeout"] or summary["error"]),
+        "checks": ordered,
+    }
+    if report_path is not None:
+        path = root / report_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+        report["report_path"] = str(report_path)
+    return report
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--run-one":
+        _run_one(sys.argv[2])
+    else:
+        report = run_verification()
+        for status, count in report["summary"].items():
+            print(f"  {status:>8}: {count}")
+        print(f"✅ Report: {report['report_path']}" if report["success"] else f"❌ Report: {report['report_path']}")
+        sys.exit(0 if report["success"] else 1)
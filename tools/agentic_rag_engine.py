@@ -6,8 +6,15 @@
 import asyncio
 import json
 import logging
+import sys
 from typing import Dict
 from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.telemetry import stage
 
 logger = logging.getLogger(__name__)
 
@@ -38,10 +45,11 @@ class AgenticRAGEngine:
             })
             
             # Step 2: Knowledge Retrieval
-            relevant_knowledge = []
-            for topic, content in self.knowledge_base.items():
-                if any(word in content.lower() for word in query_lower.split()):
-                    relevant_knowledge.append(content)
+            with stage("retrieval"):
+                relevant_knowledge = []
+                for topic, content in self.knowledge_base.items():
+                    if any(word in content.lower() for word in query_lower.split()):
+                        relevant_knowledge.append(content)
             
             steps.append({
                 "step": 2,
@@ -51,7 +59,8 @@ class AgenticRAGEngine:
             })
             
             # Step 3: Synthesis
-            response = f"""
+            with stage("synthesis"):
+                response = f"""
 Agentic RAG Analysis for: "{query}"
 
 Retrieved Knowledge:
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+💾 Async Storage - atomic, batched report and log writes off the event loop
+One writer thread owns the disk: callers queue whole-file writes and get a
+future back, so a slow fsync never stalls query handling.
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Dict, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+# "always": durable when the write completes (fsync file, then its directory)
+# "interval": fsync files written in the last ``fsync_interval`` seconds together
+# "never": leave flushing to the OS (still atomic for readers, not for crashes)
+FSYNC_POLICIES = ("always", "interval", "never")
+DEFAULT_FSYNC_INTERVAL = 1.0
+
+def fsync_directory(directory: Path):
+    """Persist a rename by syncing the directory entry (no-op where unsupported)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def write_bytes_atomic(path: Path, data: bytes, fsync: bool = True):
+    """Write to a temp file in the same directory and rename it into place
+
+    Readers see either the previous file or the complete new one, never a
+    partially written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    if fsync:
+        fsync_directory(path.parent)
+
+def encode_json(payload) -> bytes:
+    return json.dumps(payload, indent=2, default=str).encode("utf-8")
+
+def write_json_atomic(path: Path, payload: Dict, fsync: bool = True):
+    """Blocking atomic JSON write, for code already running off the event loop"""
+    write_bytes_atomic(path, encode_json(payload), fsync)
+
+class _PendingWrite:
+    __slots__ = ("data", "future")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.future: Future = Future()
+
+class AsyncStorage:
+    """Whole-file writes queued to a single writer thread
+
+    Writes to the same path that are still queued are coalesced: only the
+    newest content reaches the disk and every caller's future completes with
+    it. A single thread keeps writes to one path in submission order and
+    keeps disk stalls out of the default executor, which query work uses.
+    """
+
+    def __init__(self, fsync: str = "always", fsync_interval: float = DEFAULT_FSYNC_INTERVAL):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync} (expected one of {FSYNC_POLICIES})")
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-storage")
+        self._lock = threading.Lock()
+        self._pending: Dict[Path, _PendingWrite] = {}
+        self._dirty: Set[Path] = set()
+        self._sync_timer: Optional[threading.Timer] = None
+        self._closed = False
+
+        self.writes = 0
+        self.coalesced = 0
+        self.fsyncs = 0
+        self.bytes_written = 0
+        self.errors = 0
+
+    def submit_bytes(self, path: Union[Path, str], data: bytes) -> Future:
+        """Queue an atomic write of ``data`` to ``path`` (non-blocking)"""
+        if self._closed:
+            raise RuntimeError("Storage is closed")
+        path = Path(path)
+        with self._lock:
+            pending = self._pending.get(path)
+            if pending is not None:
+                pending.data = data
+                self.coalesced += 1
+                return pending.future
+            pending = self._pending[path] = _PendingWrite(data)
+        self._executor.submit(self._write, path)
+        return pending.future
+
+    def submit_json(self, path: Union[Path, str], payload: Dict) -> Future:
+        """Queue an atomic JSON write; the payload is serialized now, so callers may keep mutating it"""
+        return self.submit_bytes(path, encode_json(payload))
+
+    async def write_bytes(self, path: Union[Path, str], data: bytes):
+        await asyncio.wrap_future(self.submit_bytes(path, data))
+
+    async def write_json(self, path: Union[Path, str], payload: Dict):
+        await asyncio.wrap_future(self.submit_json(path, payload))
+
+    def _write(self, path: Path):
+        with self._lock:
+            pending = self._pending.pop(path)
+        try:
+            write_bytes_atomic(path, pending.data, fsync=self.fsync == "always")
+        except BaseException as e:
+            # Logged here as well: fire-and-forget callers never look at the future
+            logger.error(f"Write to {path} failed: {e}")
+            self.errors += 1
+            pending.future.set_exception(e)
+            return
+        self.writes += 1
+        self.bytes_written += len(pending.data)
+        if self.fsync == "always":
+            self.fsyncs += 1
+        elif self.fsync == "interval":
+            self._mark_dirty(path)
+        pending.future.set_result(path)
+
+    def _mark_dirty(self, path: Path):
+        with self._lock:
+            self._dirty.add(path)
+            if self._sync_timer is None:
+                self._sync_timer = threading.Timer(self.fsync_interval, self._schedule_sync)
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+
+    def _schedule_sync(self):
+        try:
+            self._executor.submit(self._sync_dirty)
+        except RuntimeError:  # Executor already shut down; close() syncs instead
+            pass
+
+    def _sync_dirty(self):
+        """Fsync every file written since the last pass, then their directories"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._sync_timer = None
+        for path in dirty:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue  # Replaced or removed since; nothing left to sync
+            try:
+                os.fsync(fd)
+                self.fsyncs += 1
+            finally:
+                os.close(fd)
+        for directory in {path.parent for path in dirty}:
+            fsync_directory(directory)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write is on disk (and synced, per policy); False on timeout"""
+        if self._closed:
+            return True
+        sync = self._sync_dirty if self.fsync == "interval" else lambda: None
+        try:
+            barrier = self._executor.submit(sync)
+        except RuntimeError:
+            # Interpreter exit already shut the executor down (after draining its queue)
+            sync()
+            return True
+        try:
+            barrier.result(timeout)
+        except FutureTimeoutError:
+            return False
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Flush queued writes and stop the writer thread"""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        with self._lock:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict:
+        return {
+            "fsync": self.fsync,
+            "queued": len(self._pending),
+            "writes": self.writes,
+            "coalesced": self.coalesced,
+            "fsyncs": self.fsyncs,
+            "bytes_written": self.bytes_written,
+            "errors": self.errors,
+        }
+
+# One writer per process, shared by reports, dashboards and profiles
+_storage: Optional[AsyncStorage] = None
+_storage_lock = threading.Lock()
+
+def get_storage() -> AsyncStorage:
+    """The process-wide storage writer (queued writes are flushed at exit)"""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = AsyncStorage()
+                atexit.register(_storage.close)
+    return _storage
+
+def benchmark_storage_writes(writes: int = 200, size: int = 16_384) -> Dict[str, Dict]:
+    """Event-loop stall per write and total wall time, blocking vs queued, per fsync policy"""
+    directory = Path(tempfile.mkdtemp(prefix="storage-bench-"))
+    data = os.urandom(size)
+    results = {}
+    try:
+        for policy in FSYNC_POLICIES:
+            start = time.perf_counter()
+            for i in range(writes):
+                write_bytes_atomic(directory / f"blocking-{i % 8}.bin", data, fsync=policy == "always")
+            blocking = time.perf_counter() - start
+
+            storage = AsyncStorage(fsync=policy)
+            stall = 0.0
+            start = time.perf_counter()
+            futures = []
+            for i in range(writes):
+                submitted = time.perf_counter()
+                futures.append(storage.submit_bytes(directory / f"queued-{i % 8}.bin", data))
+                stall += time.perf_counter() - submitted
+            for future in futures:
+                future.result()
+            storage.close()
+            results[policy] = {
+                "blocking_us_per_write": blocking / writes * 1e6,
+                "queued_stall_us_per_write": stall / writes * 1e6,
+                "queued_total_seconds": time.perf_counter() - start,
+                "disk_writes": storage.writes,
+                "coalesced": storage.coalesced,
+            }
+    finally:
+        for path in directory.iterdir():
+            path.unlink()
+        directory.rmdir()
+    return results
+
+if __name__ == "__main__":
+    print("💾 Report writes: blocking vs queued (200 x 16 KB over 8 files)")
+    for policy, result in benchmark_storage_writes().items():
+        print(f"  {policy:>8}: blocking {result['blocking_us_per_write']:8.0f} us/write, "
+              f"queued stall {result['queued_stall_us_per_write']:5.1f} us/write, "
+              f"{result['disk_writes']} disk writes ({result['coalesced']} coalesced)")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+📟 Sensor Data Ingestion for Predictive Maintenance
+Replay, MQTT and InfluxDB sources feeding the anomaly detector and the reasoner
+"""
+
+import json
+import logging
+import queue
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.anomaly_detection import RollingAnomalyDetector, summarize_findings
+
+logger = logging.getLogger(__name__)
+
+# Every reading: epoch-seconds timestamp, sensor id, production line, metric name, value
+SENSOR_FIELDS = ("timestamp", "sensor_id", "line", "metric", "value")
+
+def to_columns(readings: List[Dict]) -> Dict[str, np.ndarray]:
+    """Convert row-oriented readings into a columnar batch"""
+    frame = pd.DataFrame.from_records(readings, columns=SENSOR_FIELDS)
+    return _frame_to_columns(frame)
+
+def _frame_to_columns(frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+    timestamps = frame["timestamp"]
+    if not pd.api.types.is_numeric_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps).astype("int64") / 1e9
+    return {
+        "timestamp": timestamps.to_numpy(dtype=np.float64),
+        "sensor_id": frame["sensor_id"].astype(str).to_numpy(),
+        "line": frame["line"].to_numpy(),
+        "metric": frame["metric"].to_numpy(),
+        "value": frame["value"].to_numpy(dtype=np.float64),
+    }
+
+class ReplaySource:
+    """Replays recorded readings from a CSV or JSONL file for offline testing
+
+    With ``speed`` set, batches are paced to the recorded timestamps
+    (``speed=10`` replays ten times faster than real time).
+    """
+
+    def __init__(self, path: Path, batch_size: int = 50_000, speed: Optional[float] = None):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.speed = speed
+
+    def batches(self) -> Iterator[Dict[str, np.ndarray]]:
+        if self.path.suffix.lower() in (".jsonl", ".json"):
+            chunks = pd.read_json(self.path, lines=True, chunksize=self.batch_size)
+        else:
+            chunks = pd.read_csv(self.path, chunksize=self.batch_size)
+
+        replay_start = first_timestamp = None
+        for chunk in chunks:
+            batch = _frame_to_columns(chunk)
+            if self.speed and len(batch["timestamp"]):
+                if first_timestamp is None:
+                    first_timestamp, replay_start = batch["timestamp"][0], time.monotonic()
+                due = replay_start + (batch["timestamp"][-1] - first_timestamp) / self.speed
+                time.sleep(max(0.0, due - time.monotonic()))
+            yield batch
+
+class MQTTSource:
+    """Subscribes to sensor readings published as JSON on an MQTT broker"""
+
+    def __init__(self, host: str = "localhost", port: int = 1883, topic: str = "factory/+/sensors/#",
+                 batch_size: int = 10_000, flush_interval: float = 1.0):
+        self.host = host
+        self.port = port
+        self.topic = topic
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=batch_size * 10)
+        self._running = False
+
+    def _on_message(self, client, userdata, message):
+        try:
+            payload = json.loads(message.payload)
+            readings = payload if isinstance(payload, list) else [payload]
+            for reading in readings:
+                self._queue.put_nowait(reading)
+        except (ValueError, queue.Full) as e:
+            logger.warning(f"Dropped MQTT sensor message on {message.topic}: {e}")
+
+    def batches(self) -> Iterator[Dict[str, np.ndarray]]:
+        import paho.mqtt.client as mqtt
+
+        client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+        client.on_message = self._on_message
+        client.connect(self.host, self.port)
+        client.subscribe(self.topic)
+        client.loop_start()
+        self._running = True
+
+        try:
+            while self._running:
+                readings = []
+                deadline = time.monotonic() + self.flush_interval
+                while len(readings) < self.batch_size and time.monotonic() < deadline:
+                    try:
+                        readings.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                    except queue.Empty:
+                        break
+                if readings:
+                    yield to_columns(readings)
+        finally:
+            client.loop_stop()
+            client.disconnect()
+
+    def close(self):
+        self._running = False
+
+class InfluxSource:
+    """Reads historical readings from InfluxDB (fields: value; tags: sensor_id, line, metric)"""
+
+    def __init__(self, url: str, token: str, org: str, bucket: str, start: str = "-1h",
+                 measurement: str = "sensors", batch_size: int = 50_000):
+        self.url = url
+        self.token = token
+        self.org = org
+        self.bucket = bucket
+        self.start = start
+        self.measurement = measurement
+        self.batch_size = batch_size
+
+    def batches(self) -> Iterator[Dict[str, np.ndarray]]:
+        from influxdb_client import InfluxDBClient
+
+        flux = (
+            f'from(bucket: "{self.bucket}") |> range(start: {self.start}) '
+            f'|> filter(fn: (r) => r._measurement == "{self.measurement}" and r._field == "value")'
+        )
+        with InfluxDBClient(url=self.url, token=self.token, org=self.org) as client:
+            readings = []
+            for record in client.query_api().query_stream(flux):
+                readings.append({
+                    "timestamp": record.get_time().timestamp(),
+                    "sensor_id": record.values.get("sensor_id"),
+                    "line": record.values.get("line"),
+                    "metric": record.values.get("metric"),
+                    "value": record.get_value(),
+                })
+                if len(readings) >= self.batch_size:
+                    yield to_columns(readings)
+                    readings = []
+            if readings:
+                yield to_columns(readings)
+
+def split_by_sensor(batch: Dict[str, np.ndarray]) -> Iterator[tuple]:
+    """Yield (sensor_id, timestamps, values, metadata) per sensor, in time order"""
+    sensor_ids, inverse = np.unique(batch["sensor_id"], return_inverse=True)
+    order = np.lexsort((batch["timestamp"], inverse))
+    bounds = np.cumsum(np.bincount(inverse, minlength=len(sensor_ids)))
+
+    start = 0
+    for sensor_id, end in zip(sensor_ids, bounds):
+        rows = order[start:end]
+        first = rows[0]
+        metadata = {"line": batch["line"][first], "metric": batch["metric"][first]}
+        yield str(sensor_id), batch["timestamp"][rows], batch["value"][rows], metadata
+        start = end
+
+class SensorIngestionPipeline:
+    """Pulls batches from a source, scores them and hands findings to the reasoner"""
+
+    def __init__(self, source, detector: Optional[RollingAnomalyDetector] = None, reasoner=None):
+        self.source = source
+        self.detector = detector or RollingAnomalyDetector()
+        self.reasoner = reasoner
+
+    def run(self, max_batches: Optional[int] = None) -> Dict:
+        """Process the source until it is exhausted (or ``max_batches`` batches)"""
+        readings = batches = 0
+        findings: List[Dict] = []
+        start_time = time.perf_counter()
+
+        for batch in self.source.batches():
+            batch_findings = []
+            for sensor_id, timestamps, values, metadata in split_by_sensor(batch):
+                batch_findings.extend(self.detector.process(sensor_id, timestamps, values, metadata))
+
+            if batch_findings and self.reasoner is not None:
+                self.reasoner.ingest_sensor_findings(batch_findings)
+
+            findings.extend(batch_findings)
+            readings += len(batch["value"])
+            batches += 1
+            if max_batches is not None and batches >= max_batches:
+                break
+
+        elapsed = time.perf_counter() - start_time
+        return {
+            "readings": readings,
+            "batches": batches,
+            "anomalies": len(findings),
+            "elapsed_seconds": elapsed,
+            "readings_per_second": readings / elapsed if elapsed > 0 else 0.0,
+            "sensors": summarize_findings(findings)
+        }
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+⚙️ Query Worker Pool - CPU-bound query work on a pool of processes
+Workers build the engines once and open the retrieval index memory-mapped,
+so its pages are shared through the OS page cache instead of copied per worker.
+"""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools import telemetry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = Path("data/models/retrieval_index.npy")
+INDEX_TARGET = "index"  # Pseudo-component for searches over the mmap index
+
+# The pool provides the parallelism: one BLAS/OpenMP thread per worker
+WORKER_THREAD_ENV = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+def construct_component(spec: Dict):
+    """Import, construct and warm up one component from its spec"""
+    import importlib
+
+    component = getattr(importlib.import_module(spec["module"]), spec["class"])()
+    if spec.get("warmup"):
+        getattr(component, spec["warmup"])()
+    return component
+
+def search_index(index, vector, k: int = 10) -> List[Tuple[int, float]]:
+    """Top-k rows of ``index`` by dot product with ``vector``"""
+    import numpy as np
+
+    scores = index @ np.asarray(vector, dtype=index.dtype)
+    k = min(k, len(scores))
+    top = np.argpartition(scores, -k)[-k:]
+    top = top[np.argsort(scores[top])[::-1]]
+    return [(int(row), float(scores[row])) for row in top]
+
+def _worker_main(worker_id: int, specs: Dict[str, Dict], index_path: Optional[str],
+                 tasks, results, heartbeats, assigned, started, halt, heartbeat_interval: float):
+    """Worker process: load once, then pull tasks until the stop sentinel or a halt request
+
+    The id of the task being run is written to ``assigned[worker_id]`` as soon
+    as it is dequeued, so the parent can fail it if this process dies with it.
+    """
+    for name in WORKER_THREAD_ENV:
+        os.environ.setdefault(name, "1")
+    parent_pid = os.getppid()
+
+    components = {}
+    for name, spec in specs.items():
+        try:
+            components[name] = construct_component(spec)
+        except Exception as e:
+            logger.warning(f"Worker {worker_id}: {name} unavailable ({e})")
+
+    index = None
+    if index_path and Path(index_path).exists():
+        import numpy as np
+
+        index = np.load(index_path, mmap_mode="r")
+
+    # Held around every queue operation: exiting while holding a queue's lock would wedge the other
+    # workers. ``results`` is a SimpleQueue, written synchronously rather than by a feeder thread,
+    # so outside this lock no lock is held and a task that crashes the process takes none with it.
+    io = threading.Lock()
+    stop = threading.Event()
+
+    def beat():
+        # Heartbeats come from a thread, so a long CPU-bound task still reports in
+        while not stop.wait(heartbeat_interval):
+            heartbeats[worker_id] = time.time()
+            if halt[worker_id] and assigned[worker_id]:
+                with io:  # Halted mid-task: leave between queue operations
+                    os._exit(1)
+
+    heartbeats[worker_id] = time.time()
+    threading.Thread(target=beat, name="heartbeat", daemon=True).start()
+
+    available = sorted(components) + ([INDEX_TARGET] if index is not None else [])
+    with io:
+        results.put(("ready", worker_id, available))
+
+    loop = asyncio.new_event_loop()
+    while not halt[worker_id]:
+        with io:
+            try:
+                task = tasks.get(timeout=heartbeat_interval)
+            except queue.Empty:
+                if os.getppid() != parent_pid:
+                    break  # Orphaned: the pool's process died without closing it
+                continue
+            if task is None:
+                break
+            if halt[worker_id]:
+                tasks.put(task)  # Leave it for the replacement worker
+                break
+            task_id, trace_id, target, method, args = task
+            started[worker_id] = time.time()
+            assigned[worker_id] = task_id
+
+        # Continue the caller's trace; its spans go back with the result
+        with telemetry.trace(trace_id, remote=True) as task_trace:
+            try:
+                if target == INDEX_TARGET:
+                    if index is None:
+                        raise RuntimeError("No retrieval index loaded")
+                    with telemetry.stage("retrieval"):
+                        value = search_index(index, *args)
+                else:
+                    value = getattr(components[target], method)(*args)
+                    if asyncio.iscoroutine(value):
+                        value = loop.run_until_complete(value)
+                outcome = ("done", task_id, value, None)
+            except Exception as e:
+                outcome = ("done", task_id, None, f"{type(e).__name__}: {e}")
+        with io:
+            results.put(outcome + (task_trace.spans,))
+            assigned[worker_id] = 0
+
+    stop.set()
+    loop.close()
+
+class QueryWorkerPool:
+    """Process pool running engine methods and index searches off the event loop
+
+    All workers pull from one shared task queue, so an idle worker always
+    takes the next task and a slow query never holds up work queued behind
+    it. A monitor thread checks each worker's heartbeat and running task:
+    a worker that exits, stops heartbeating for ``heartbeat_timeout`` or runs
+    one task past ``task_timeout`` is replaced, and its task fails.
+
+    Each worker records the task it dequeued in a shared slot, so the task of
+    a worker that dies is known even if none of its messages arrived. A live
+    worker is asked to halt between queue operations; it is only terminated
+    if it does not (e.g. wedged in native code holding the GIL).
+    """
+
+    def __init__(self, workers: Optional[int] = None, components: Optional[Dict[str, Dict]] = None,
+                 index_path: Optional[Path] = DEFAULT_INDEX_PATH, heartbeat_interval: float = 1.0,
+                 heartbeat_timeout: float = 10.0, task_timeout: float = 60.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.components = components or {}
+        self.index_path = str(index_path) if index_path else None
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.task_timeout = task_timeout
+
+        self._context = multiprocessing.get_context("spawn")
+        self._tasks = self._context.Queue()
+        self._results = self._context.SimpleQueue()  # None from close() stops the collector
+        self._heartbeats = self._context.Array("d", self.workers, lock=False)
+        self._assigned = self._context.Array("q", self.workers, lock=False)  # Task id per worker, 0 when idle
+        self._started = self._context.Array("d", self.workers, lock=False)  # When that task was dequeued
+        self._halt = self._context.Array("b", self.workers, lock=False)
+        self._processes: List = [None] * self.workers
+        self._ready = [threading.Event() for _ in range(self.workers)]
+        self._pending: Dict[int, Future] = {}  # task id -> future
+        self._traces: Dict[int, telemetry.Trace] = {}  # task id -> submitting request's trace
+        self._task_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._closing = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+        self.available: set = set()
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+
+    def start(self, wait: bool = True, timeout: float = 120.0) -> "QueryWorkerPool":
+        """Spawn the workers; optionally wait until each has loaded its components"""
+        for worker_id in range(self.workers):
+            self._spawn(worker_id)
+        for target, name in ((self._collect, "pool-results"), (self._monitor, "pool-monitor")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        if wait:
+            deadline = time.monotonic() + timeout
+            for event in self._ready:
+                if not event.wait(max(0.0, deadline - time.monotonic())):
+                    raise RuntimeError(f"Worker pool did not start within {timeout:.0f}s")
+        return self
+
+    def submit(self, target: str, method: str, *args) -> Future:
+        """Queue ``target.method(*args)`` on the pool (coroutines are awaited in the worker)"""
+        if self._closing.is_set():
+            raise RuntimeError("Worker pool is closed")
+        future: Future = Future()
+        task_id = next(self._task_ids)
+        request_trace = telemetry.current_trace()
+        with self._lock:
+            self._pending[task_id] = future
+            if request_trace is not None:
+                self._traces[task_id] = request_trace
+        trace_id = request_trace.trace_id if request_trace is not None else None
+        self._tasks.put((task_id, trace_id, target, method, args))
+        return future
+
+    async def run(self, target: str, method: str, *args):
+        """Awaitable ``submit``"""
+        return await asyncio.wrap_future(self.submit(target, method, *args))
+
+    def search(self, vector, k: int = 10) -> Future:
+        """Top-k search over the memory-mapped retrieval index"""
+        return self.submit(INDEX_TARGET, "search", vector, k)
+
+    def health(self) -> List[Dict]:
+        """Per-worker liveness, heartbeat age and running task"""
+        now = time.time()
+        report = []
+        for worker_id, process in enumerate(self._processes):
+            busy = bool(self._assigned[worker_id])
+            report.append({
+                "worker": worker_id,
+                "pid": process.pid if process else None,
+                "alive": bool(process and process.is_alive()),
+                "ready": self._ready[worker_id].is_set(),
+                "heartbeat_age": now - self._heartbeats[worker_id] if self._heartbeats[worker_id] else None,
+                "running_task_seconds": now - self._started[worker_id] if busy else None,
+            })
+        return report
+
+    def stats(self) -> Dict:
+        with self._lock:
+            queued = len(self._pending.keys() - set(self._assigned))
+        return {
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "restarts": self.restarts,
+            "queued": queued,
+        }
+
+    def close(self, timeout: float = 5.0):
+        """Stop the workers after their current task; fail anything still queued"""
+        if self._closing.is_set():
+            return
+        self._closing.set()
+        for _ in self._processes:
+            self._tasks.put(None)
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            if process is not None:
+                process.join(max(0.0, deadline - time.monotonic()))
+                if process.is_alive():
+                    process.terminate()
+        self._results.put(None)  # After every result the workers sent
+        for thread in self._threads:
+            thread.join(timeout)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._traces.clear()
+        for future in pending.values():
+            future.set_exception(RuntimeError("Worker pool closed"))
+
+    def _spawn(self, worker_id: int):
+        self._ready[worker_id].clear()
+        self._heartbeats[worker_id] = 0.0
+        self._assigned[worker_id] = 0
+        self._halt[worker_id] = 0
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker_id, self.components, self.index_path, self._tasks, self._results,
+                  self._heartbeats, self._assigned, self._started, self._halt, self.heartbeat_interval),
+            name=f"query-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[worker_id] = process
+
+    def _collect(self):
+        while True:
+            message = self._results.get()
+            if message is None:
+                break
+
+            kind = message[0]
+            if kind == "ready":
+                _, worker_id, available = message
+                self.available = set(available) if not self.available else self.available & set(available)
+                self._ready[worker_id].set()
+            else:
+                _, task_id, value, error, spans = message
+                with self._lock:
+                    future = self._pending.pop(task_id, None)  # None if its worker was already replaced
+                    request_trace = self._traces.pop(task_id, None)
+                telemetry.record_spans(spans, request_trace)
+                if future is None:
+                    continue
+                if error is None:
+                    self.completed += 1
+                    future.set_result(value)
+                else:
+                    self.failed += 1
+                    future.set_exception(RuntimeError(error))
+
+    def _monitor(self):
+        while not self._closing.wait(self.heartbeat_interval):
+            now = time.time()
+            for worker_id, process in enumerate(self._processes):
+                busy = bool(self._assigned[worker_id])
+                heartbeat = self._heartbeats[worker_id]
+
+                if not process.is_alive():
+                    reason = f"exited with code {process.exitcode}"
+                elif heartbeat and now - heartbeat > self.heartbeat_timeout:
+                    reason = f"missed heartbeats for {now - heartbeat:.0f}s"
+                elif busy and now - self._started[worker_id] > self.task_timeout:
+                    reason = f"task ran longer than {self.task_timeout:g}s"
+                else:
+                    continue
+                self._replace(worker_id, reason)
+
+    def _replace(self, worker_id: int, reason: str):
+        """Restart one worker; its in-flight task fails rather than crash the next worker too"""
+        process = self._processes[worker_id]
+        if process.is_alive():
+            self._halt[worker_id] = 1
+            process.join(max(5.0, 3 * self.heartbeat_interval))
+        if process.is_alive():
+            # Last resort: a kill mid queue operation can leave that queue's lock held
+            logger.warning(f"Worker {worker_id} (pid {process.pid}) did not halt; terminating")
+            process.terminate()
+            process.join(5.0)
+        logger.warning(f"Worker {worker_id} (pid {process.pid}) {reason}; restarting")
+
+        # The process is gone, so its slot names the task it died with, whether or not it reported in
+        with self._lock:
+            task_id = self._assigned[worker_id]
+            future = self._pending.pop(task_id, None) if task_id else None
+            self._traces.pop(task_id, None)
+        if future is not None:
+            self.failed += 1
+            future.set_exception(RuntimeError(f"Worker {worker_id} {reason}"))
+
+        self.restarts += 1
+        if not self._closing.is_set():
+            self._spawn(worker_id)
+
+def benchmark_worker_pool(worker_counts=(1, 2, 4), rows: int = 200_000, dim: int = 128,
+                          searches: int = 400) -> Dict[int, float]:
+    """Index searches per second for each pool size, over a synthetic mmap index"""
+    import numpy as np
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = Path(tmp) / "index.npy"
+        rng = np.random.default_rng(0)
+        np.save(index_path, rng.standard_normal((rows, dim), dtype=np.float32))
+        queries = rng.standard_normal((searches, dim), dtype=np.float32)
+
+        for workers in worker_counts:
+            pool = QueryWorkerPool(workers, index_path=index_path).start()
+            try:
+                pool.search(queries[0]).result()  # Fault the index pages in
+                start = time.perf_counter()
+                futures = [pool.search(vector) for vector in queries]
+                for future in futures:
+                    future.result()
+                results[workers] = searches / (time.perf_counter() - start)
+            finally:
+                pool.close()
+    return results
+
+if __name__ == "__main__":
+    print(f"⚙️ Worker pool index search throughput ({os.cpu_count()} cores)")
+    for workers, rate in benchmark_worker_pool().items():
+        print(f"  {workers:>2} workers: {rate:8.1f} searches/s")